@@ -0,0 +1,298 @@
+"""
+A configurable local stand-in for the EIA v2 API.
+
+The one fake server of the repo: the tests run it in a thread (see
+``tests/conftest.py``) and the benchmarks in its own process (see
+:func:`serve`), so it doesn't compete with the client for the GIL.
+
+Requests without an ``api_key`` are refused (403) and every accepted request
+is recorded in ``requests``. ``datasets`` are lists of rows filtered, sorted
+and paged the way the API does, and ``metadata`` holds the route metadata
+(facet values are derived from the dataset rows). With a ``total``, any other
+``/v2/<route>/data`` url serves that many synthetic (or recorded) rows, paged
+by ``offset`` and ``length`` only and cached once encoded, so serving them
+costs next to nothing. Latency, ETags and error/429 responses can be
+injected.
+"""
+
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Event, Process, Queue
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+
+@dataclass
+class ServerConfig:
+    """
+    Fake server configuration.
+
+    :param total: Rows of the synthetic dataset served for ``/data`` urls
+     that aren't in ``datasets`` (0 for none).
+    :param latency: Seconds added before each response (server think time).
+    :param error_rate: Fraction of requests answered with a 503.
+    :param rate_limit_rate: Fraction of requests answered with a 429.
+    :param retry_after: Retry-After header (seconds) of injected errors.
+    :param payload: A recorded EIA response (JSON file) whose rows are
+     repeated to fill the synthetic dataset (optional, synthetic rows if not
+     provided).
+    :param seed: Seed of the error injection.
+    """
+
+    total: int = 50_000
+    latency: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: str = "0"
+    payload: str = None
+    seed: int = 0
+
+
+def synthetic_row(i: int) -> dict:
+    """The i-th row of a synthetic monthly dataset (one series per 600 rows)."""
+    series, month = divmod(i, 600)
+    year, month = 1973 + month // 12, month % 12 + 1
+    return {
+        "period": f"{year}-{month:02d}",
+        "msn": f"SERIES{series:04d}",
+        "seriesDescription": f"Synthetic series {series}",
+        "value": f"{(i * 7919) % 100000 / 100:.2f}",
+        "unit": "Billion Kilowatthours",
+    }
+
+
+def decode_query(query: str) -> dict:
+    """Decode EIA v2 url query parameters (data[0]=, facets[msn][]=, ...)."""
+    params = {"data": [], "facets": {}, "sort": []}
+    for name, value in parse_qsl(query):
+        keys = re.findall(r"\[([^\]]*)\]", name)
+        base = name.split("[")[0]
+        if base == "data":
+            params["data"].append(value)
+        elif base == "facets":
+            params["facets"].setdefault(keys[0], []).append(value)
+        elif base == "sort":
+            while len(params["sort"]) <= int(keys[0]):
+                params["sort"].append({})
+            params["sort"][int(keys[0])][keys[1]] = value
+        elif base in ("offset", "length"):
+            params[base] = int(value)
+        else:
+            params[base] = value
+    return params
+
+
+class FakeEIA(ThreadingHTTPServer):
+    """
+    The fake EIA server (see :func:`serve` to run it in a process).
+
+    :param config: Synthetic dataset, latency and failure injection
+     (optional, no synthetic dataset by default).
+    :param port: The port (default: any free port).
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, config: ServerConfig = None, port: int = 0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.config = ServerConfig(total=0) if config is None else config
+        self.datasets = {}
+        self.metadata = {}
+        self.requests = []
+        self.etags = False
+        self.failures = []
+        self.latency = self.config.latency
+        self.random = random.Random(self.config.seed)
+        self.lock = threading.Lock()
+        self.bodies = {}
+        self.rows = None
+        if self.config.payload is not None:
+            payload = json.loads(Path(self.config.payload).read_text(encoding="utf-8"))
+            self.rows = payload["response"]["data"]
+
+    @property
+    def url(self) -> str:
+        """Base url (equivalent of https://api.eia.gov/v2)."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v2"
+
+    def describe(self, route: str) -> dict:
+        """Metadata of a route or the values of a facet (None if unknown)."""
+        if route in self.metadata:
+            return {"response": self.metadata[route]}
+        parent, _, facet = route.partition("/facet/")
+        if parent not in self.metadata or not facet:
+            return None
+        values = dict.fromkeys(
+            row[facet]
+            for row in self.datasets.get(f"{parent}/data", [])
+            if facet in row
+        )
+        facets = [{"id": value, "name": value} for value in values]
+        return {"response": {"totalFacets": len(facets), "facets": facets}}
+
+    def query(self, route: str, params: dict) -> dict:
+        """Filter, sort and page a dataset the way the API does."""
+        rows = self.datasets.get(route, [])
+        for facet, values in (params.get("facets") or {}).items():
+            rows = [row for row in rows if row.get(facet) in values]
+        if params.get("start"):
+            rows = [row for row in rows if row["period"] >= params["start"]]
+        if params.get("end"):
+            rows = [row for row in rows if row["period"] <= params["end"]]
+        for sort in reversed(params.get("sort") or []):
+            rows = sorted(
+                rows,
+                key=lambda row, col=sort["column"]: row[col],
+                reverse=sort.get("direction") == "desc",
+            )
+        offset = int(params.get("offset") or 0)
+        length = int(params.get("length") or 5000)
+        return {
+            "response": {
+                "total": str(len(rows)),
+                "dateFormat": "YYYY-MM",
+                "frequency": params.get("frequency", "monthly"),
+                "data": rows[offset : offset + length],
+                "description": "Synthetic data.",
+            },
+            "request": {"command": route, "params": params},
+            "apiVersion": "2.1.0",
+        }
+
+    def row(self, i: int) -> dict:
+        """The i-th row of the synthetic dataset."""
+        if self.rows:
+            return self.rows[i % len(self.rows)]
+        return synthetic_row(i)
+
+    def page(self, route: str, offset: int, length: int) -> bytes:
+        """Encoded synthetic page (cached, so encoding isn't measured)."""
+        key = (route, offset, length)
+        if key not in self.bodies:
+            stop = min(offset + length, self.config.total)
+            payload = {
+                "response": {
+                    "total": str(self.config.total),
+                    "dateFormat": "YYYY-MM",
+                    "frequency": "monthly",
+                    "data": [self.row(i) for i in range(offset, stop)],
+                    "description": "Synthetic data.",
+                },
+                "request": {"command": route},
+                "apiVersion": "2.1.0",
+            }
+            self.bodies[key] = json.dumps(payload).encode("utf-8")
+        return self.bodies[key]
+
+    def body(self, route: str, params: dict) -> bytes:
+        """The encoded response of a route (None if unknown)."""
+        if route in self.datasets:
+            return json.dumps(self.query(route, params)).encode("utf-8")
+        payload = self.describe(route)
+        if payload is not None:
+            return json.dumps(payload).encode("utf-8")
+        if self.config.total and route.endswith("/data"):
+            offset = int(params.get("offset") or 0)
+            return self.page(route, offset, int(params.get("length") or 5000))
+        return None
+
+    def failure(self) -> int:
+        """The status of a queued or injected failure (None for no failure)."""
+        with self.lock:
+            if self.failures:
+                return self.failures.pop(0)
+            draw = self.random.random()
+        if draw < self.config.rate_limit_rate:
+            return 429
+        if draw < self.config.rate_limit_rate + self.config.error_rate:
+            return 503
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Serve a page or a metadata response."""
+        url = urlsplit(self.path)
+        route = url.path.rstrip("/")
+        params = decode_query(url.query)
+        if params.pop("api_key", None) is None:
+            self._send(403)
+            return
+        self.server.requests.append((route, params))
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        body = self.server.body(route, params)
+        if body is None:
+            self._send(404)
+            return
+        status = self.server.failure()
+        if status is not None:
+            self._send(status, headers={"Retry-After": self.server.config.retry_after})
+            return
+        headers = {"Content-Type": "application/json"}
+        if self.server.etags:
+            headers["ETag"] = f'"{hashlib.sha256(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                self._send(304)
+                return
+        self._send(200, body, headers)
+
+    def _send(self, status: int, body: bytes = b"", headers: dict = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def _run(config: ServerConfig, ports: Queue, stop: Event) -> None:
+    server = FakeEIA(config)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    ports.put(server.server_address[1])
+    stop.wait()
+    server.shutdown()
+    server.server_close()
+
+
+class serve:  # pylint: disable=invalid-name
+    """
+    Run a fake EIA server in a child process (a context manager).
+
+    ::
+
+        with serve(ServerConfig(total=100_000, latency=0.02)) as base_url:
+            ...  # base_url is the equivalent of https://api.eia.gov/v2
+
+    """
+
+    def __init__(self, config: ServerConfig):
+        self._config = config
+        self._stop = Event()
+        self._process = None
+
+    def __enter__(self) -> str:
+        ports = Queue()
+        self._process = Process(
+            target=_run, args=(self._config, ports, self._stop), daemon=True
+        )
+        self._process.start()
+        return f"http://127.0.0.1:{ports.get(timeout=30)}/v2"
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._process.join(timeout=10)
@@ -0,0 +1,89 @@
+"""
+Import time benchmark.
+
+Times fresh interpreter imports of the package entry points (median of
+``--repeat`` runs, minus the bare interpreter start up)::
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --json imports.json
+    python benchmarks/import_time.py --baseline imports.json --tolerance 0.5
+
+With ``--baseline`` the exit status is 1 if any import got slower by more
+than the tolerance (and more than 10ms), e.g. because a heavy dependency is
+imported eagerly again.
+"""
+
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+
+STATEMENTS = {
+    "package": "import eia_client",
+    "cli": "import eia_client.cli",
+    "endpoint": "from eia_client.endpoint import TotalEnergy",
+    "client": "from eia_client import Client",
+    "parse": "import eia_client.parse; eia_client.parse.pd.DataFrame",
+}
+_SLACK = 0.010
+
+
+def _time(statement: str, repeat: int) -> float:
+    """Median seconds to run a statement in a fresh interpreter."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(argv: list = None) -> int:
+    """Run the benchmark."""
+    arg_parser = ArgumentParser(
+        description=__doc__.split("\n\n")[0].strip(),
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    arg_parser.add_argument("--repeat", type=int, default=7, help="Runs per import.")
+    arg_parser.add_argument("--json", default=None, help="Write results to a file.")
+    arg_parser.add_argument(
+        "--baseline", default=None, help="Results file to compare against."
+    )
+    arg_parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="Allowed slow down."
+    )
+    args = arg_parser.parse_args(argv)
+    interpreter = _time("pass", args.repeat)
+    results = {
+        name: max(_time(statement, args.repeat) - interpreter, 0.0)
+        for name, statement in STATEMENTS.items()
+    }
+    print(f"{'import':<10} {'ms':>8}")
+    for name, seconds in results.items():
+        print(f"{name:<10} {seconds * 1e3:>8.1f}")
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        slower = [
+            name
+            for name, seconds in results.items()
+            if name in baseline
+            and seconds > baseline[name] * (1 + args.tolerance) + _SLACK
+        ]
+        for name in slower:
+            print(
+                f"REGRESSION {name}: {results[name] * 1e3:.1f}ms "
+                f"(was {baseline[name] * 1e3:.1f}ms)"
+            )
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
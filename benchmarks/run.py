@@ -0,0 +1,323 @@
+"""
+Offline EIA client benchmarks.
+
+Runs ingest scenarios against a local fake EIA server (see ``fake_eia.py``)
+and reports throughput, request latency percentiles and peak memory::
+
+    python benchmarks/run.py
+    python benchmarks/run.py --scenario get-all-parallel --total 200000
+    python benchmarks/run.py --json results.json
+    python benchmarks/run.py --baseline results.json --tolerance 0.2
+
+With ``--baseline`` the exit status is 1 if any scenario's throughput dropped
+by more than the tolerance, so ingest regressions fail a release check.
+"""
+
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from typing import Callable
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from eia_client import parse
+from eia_client.api_key import ApiKey
+from eia_client.client import Client
+from eia_client.endpoint import TotalEnergy
+from eia_client.endpoint.builder import Endpoint
+from eia_client.retry import RetryPolicy
+
+from fake_eia import ServerConfig, serve
+
+
+API_KEY = ApiKey("BENCHMARK")
+SCHEMA = TotalEnergy.SCHEMA
+
+_POOL = []
+
+
+@dataclass
+class Scenario:
+    """
+    A benchmark scenario.
+
+    :param name: The scenario name.
+    :param run: Fetches the data given the server base url and a client
+     factory (taking client keyword arguments), returns the number of rows.
+    :param server: The fake server configuration.
+    :param description: What is measured.
+    """
+
+    name: str
+    run: Callable
+    server: ServerConfig
+    description: str = ""
+
+
+@dataclass
+class Result:
+    """
+    Measurements of a scenario (times in seconds, memory in MiB).
+
+    ``requests`` counts HTTP requests including retries and the latency
+    percentiles are per request, retries and backoff included.
+    """
+
+    name: str
+    rows: int
+    requests: int
+    seconds: float
+    rows_per_second: float
+    mib_per_second: float
+    latency_p50: float
+    latency_p90: float
+    latency_p99: float
+    peak_mib: float
+
+
+def _endpoint(base: str, length: int = 5000) -> Endpoint:
+    params = TotalEnergy(api_key=API_KEY, length=length).build().params
+    return Endpoint(f"{base}/total-energy/data", replace(params, facets={}))
+
+
+def _get_as_dataframe(base: str, client: Callable) -> int:
+    return parse.as_dataframe(client().get(_endpoint(base))).shape[0]
+
+
+def _get_all(**kwargs) -> Callable:
+    """A scenario run calling get_all (get_all or Client keyword arguments)."""
+    options = {k: kwargs.pop(k) for k in ("schema", "stream") if k in kwargs}
+
+    def run(base: str, client: Callable) -> int:
+        return client(**kwargs).get_all(_endpoint(base), **options).shape[0]
+
+    return run
+
+
+def _get_all_arrow(base: str, client: Callable) -> int:
+    table = client(max_workers=4).get_all_arrow(_endpoint(base), schema=SCHEMA)
+    return table.num_rows
+
+
+def _get_all_parse_pool(base: str, client: Callable) -> int:
+    if not _POOL:
+        _POOL.append(ProcessPoolExecutor(max_workers=4))  # Started by the warm up.
+    data_df = client(max_workers=4, parse_pool=_POOL[0]).get_all(
+        _endpoint(base), schema=SCHEMA
+    )
+    return data_df.shape[0]
+
+
+def _async_get_all(base: str, client: Callable) -> int:
+    # pylint: disable=import-outside-toplevel,unused-argument
+    from eia_client.async_client import AsyncClient
+
+    async def run() -> int:
+        async with AsyncClient(api_key=API_KEY, max_concurrency=4) as async_client:
+            data_df = await async_client.get_all(_endpoint(base), schema=SCHEMA)
+        return data_df.shape[0]
+
+    return asyncio.run(run())
+
+
+SCENARIOS = [
+    Scenario(
+        "get-as-dataframe",
+        _get_as_dataframe,
+        ServerConfig(total=5000),
+        "One 5000 row page: Client.get + parse.as_dataframe.",
+    ),
+    Scenario(
+        "get-all-serial",
+        _get_all(),
+        ServerConfig(),
+        "Paginated get_all, one page at a time.",
+    ),
+    Scenario(
+        "get-all-typed",
+        _get_all(schema=SCHEMA),
+        ServerConfig(),
+        "Paginated get_all parsed with a schema.",
+    ),
+    Scenario(
+        "get-all-parallel",
+        _get_all(max_workers=4, schema=SCHEMA),
+        ServerConfig(latency=0.02),
+        "get_all with 4 workers and 20ms server latency.",
+    ),
+    Scenario(
+        "get-all-stream",
+        _get_all(max_workers=4, schema=SCHEMA, stream=True),
+        ServerConfig(latency=0.02),
+        "Streamed, incrementally parsed get_all with 4 workers.",
+    ),
+    Scenario(
+        "get-all-parse-pool",
+        _get_all_parse_pool,
+        ServerConfig(latency=0.02),
+        "get_all with 4 workers parsing in a 4 process pool.",
+    ),
+    Scenario(
+        "get-all-arrow",
+        _get_all_arrow,
+        ServerConfig(latency=0.02),
+        "get_all_arrow with 4 workers.",
+    ),
+    Scenario(
+        "get-all-429",
+        _get_all(
+            max_workers=4,
+            schema=SCHEMA,
+            retry=RetryPolicy(max_attempts=10, backoff_base=0.01, backoff_cap=0.1),
+        ),
+        ServerConfig(latency=0.02, rate_limit_rate=0.1, error_rate=0.05),
+        "get_all with 4 workers, 10% 429s and 5% 503s retried.",
+    ),
+    Scenario(
+        "async-get-all",
+        _async_get_all,
+        ServerConfig(latency=0.02),
+        "AsyncClient.get_all with 4 concurrent requests (requires aiohttp, no "
+        "request metrics).",
+    ),
+]
+
+
+def _percentile(values: list, percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * percent / 100), len(values) - 1)]
+
+
+def _measure(scenario: Scenario, base: str, repeat: int) -> Result:
+    """Warm up once, time repeat runs (median) then measure peak memory."""
+    durations = []
+    sizes = []
+    attempts = []
+
+    def hook(event) -> None:
+        if event.name == "request":
+            durations.append(event.duration)
+            sizes.append(event.attributes.get("bytes", 0))
+            attempts.append(event.attributes["attempts"])
+
+    def client(**kwargs) -> Client:
+        return Client(api_key=API_KEY, hooks=[hook], **kwargs)
+
+    scenario.run(base, client)
+    durations.clear()
+    sizes.clear()
+    attempts.clear()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = scenario.run(base, client)
+        times.append(time.perf_counter() - start)
+    seconds = statistics.median(times)
+    requests = sum(attempts) // repeat
+    mib = sum(sizes) / repeat / 2**20
+    tracemalloc.start()
+    scenario.run(base, client)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return Result(
+        name=scenario.name,
+        rows=rows,
+        requests=requests,
+        seconds=seconds,
+        rows_per_second=rows / seconds,
+        mib_per_second=mib / seconds,
+        latency_p50=_percentile(durations, 50),
+        latency_p90=_percentile(durations, 90),
+        latency_p99=_percentile(durations, 99),
+        peak_mib=peak / 2**20,
+    )
+
+
+def _regressions(results: list, baseline: dict, tolerance: float) -> list:
+    """Scenarios whose throughput dropped by more than tolerance."""
+    slower = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            continue
+        floor = previous["rows_per_second"] * (1 - tolerance)
+        if result.rows_per_second < floor:
+            slower.append((result.name, previous["rows_per_second"], floor))
+    return slower
+
+
+def _print(results: list) -> None:
+    header = (
+        f"{'scenario':<18} {'rows':>8} {'reqs':>5} {'sec':>7} {'rows/s':>10} "
+        f"{'MiB/s':>7} {'p50 ms':>7} {'p90 ms':>7} {'p99 ms':>7} {'peak MiB':>9}"
+    )
+    print(header)
+    for r in results:
+        print(
+            f"{r.name:<18} {r.rows:>8} {r.requests:>5} {r.seconds:>7.3f} "
+            f"{r.rows_per_second:>10.0f} {r.mib_per_second:>7.1f} "
+            f"{r.latency_p50 * 1e3:>7.1f} {r.latency_p90 * 1e3:>7.1f} "
+            f"{r.latency_p99 * 1e3:>7.1f} {r.peak_mib:>9.1f}"
+        )
+
+
+def main(argv: list = None) -> int:
+    """Run the benchmarks."""
+    arg_parser = ArgumentParser(
+        description=__doc__.split("\n\n")[0].strip(),
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    arg_parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[s.name for s in SCENARIOS],
+        help="Scenario to run (repeatable, default all).",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Timed runs.")
+    arg_parser.add_argument(
+        "--total", type=int, default=None, help="Rows per dataset (override)."
+    )
+    arg_parser.add_argument("--json", default=None, help="Write results to a file.")
+    arg_parser.add_argument(
+        "--baseline", default=None, help="Results file to compare against."
+    )
+    arg_parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed throughput drop."
+    )
+    args = arg_parser.parse_args(argv)
+    results = []
+    for scenario in SCENARIOS:
+        if args.scenario and scenario.name not in args.scenario:
+            continue
+        if scenario.name.startswith("async"):
+            try:
+                import aiohttp  # pylint: disable=import-outside-toplevel,unused-import
+            except ImportError:
+                print(f"Skipping {scenario.name}: aiohttp is not installed")
+                continue
+        if args.total is not None and scenario.server.total > 5000:
+            server = replace(scenario.server, total=args.total)
+            scenario = replace(scenario, server=server)
+        with serve(scenario.server) as base:
+            results.append(_measure(scenario, base, args.repeat))
+    _print(results)
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({r.name: asdict(r) for r in results}, file, indent=2)
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as file:
+            slower = _regressions(results, json.load(file), args.tolerance)
+        for name, previous, floor in slower:
+            print(f"REGRESSION {name}: below {floor:.0f} rows/s (was {previous:.0f})")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
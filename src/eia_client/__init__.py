@@ -1,9 +1,46 @@
-"""EIA Open Data API Client Package."""
+"""EIA Open Data API Client Package.
+
+Submodules (and ``Client``/``AsyncClient``) are imported on first access, so
+``import eia_client`` doesn't import pandas, pyarrow or requests.
+"""
+
+import importlib
 
 __version__ = "0.4.1"
 
 
-from eia_client import api_key
-from eia_client import endpoint
-from eia_client import parse
-from eia_client.client import Client
+_SUBMODULES = (
+    "api_key",
+    "cache",
+    "endpoint",
+    "exceptions",
+    "instrument",
+    "metadata",
+    "panel",
+    "parse",
+    "period",
+    "planner",
+    "rate_limit",
+    "result_cache",
+    "retry",
+    "store",
+    "sync",
+)
+_ATTRIBUTES = {
+    "Client": "eia_client.client",
+    "AsyncClient": "eia_client.async_client",
+}
+
+__all__ = [*_SUBMODULES, *_ATTRIBUTES]
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in _ATTRIBUTES:
+        return getattr(importlib.import_module(_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted([*globals(), *__all__])
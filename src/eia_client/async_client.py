@@ -0,0 +1,178 @@
+"""EIA asyncio client module.
+
+Requires the optional ``aiohttp`` dependency (``pip install eia_client[async]``).
+"""
+
+from __future__ import annotations
+
+from typing import AsyncIterator, List
+import asyncio
+import importlib.util
+import logging
+
+from requests import Response
+
+from eia_client import api_key as ak
+from eia_client import parse
+from eia_client import utils
+from eia_client.client import _offsets, _page, _total
+from eia_client.endpoint.builder import Endpoint
+from eia_client.exceptions import RetryError
+from eia_client.rate_limit import TokenBucket
+from eia_client.retry import RetryPolicy
+
+
+pd = utils.LazyModule("pandas")
+aiohttp = utils.LazyModule("aiohttp")
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncClient:
+    """
+    EIA asyncio client class.
+
+    Mirrors :class:`eia_client.client.Client` for use inside an event loop.
+    Requests share one pooled ``aiohttp`` session and at most
+    ``max_concurrency`` of them are in flight at a time. Responses are
+    returned as ``requests`` responses so the ``parse`` module works
+    unchanged.
+
+    :param session: An aiohttp client session (optional). When not provided a
+     session is created on first use and closed by :meth:`close`.
+    :param api_key: ApiKey data class (optional, loaded if not provided).
+    :param max_concurrency: Maximum number of requests in flight.
+    :param retry: A retry policy (optional, see :class:`Client`).
+    :param rate_limit: A token bucket (optional, see :class:`Client`). It can be
+     shared with threaded clients.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession = None,
+        api_key: ak.ApiKey = None,
+        max_concurrency: int = 8,
+        retry: RetryPolicy = None,
+        rate_limit: TokenBucket = None,
+    ):
+        if importlib.util.find_spec("aiohttp") is None:
+            raise RuntimeError("AsyncClient requires aiohttp: pip install aiohttp")
+        self._max_concurrency = max(max_concurrency, 1)
+        self._session = session
+        self._owns_session = session is None
+        self._api_key = ak.load() if api_key is None else api_key
+        self._semaphore = None
+        self._retry = RetryPolicy(max_attempts=1) if retry is None else retry
+        self._rate_limit = rate_limit
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying session if it was created by the client."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+
+    async def get(self, endpoint: Endpoint) -> Response:
+        """EIA Client get endpoint (async)."""
+        prepared = endpoint.prepare()
+        params = prepared.with_api_key(self._api_key)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                resp = await self._send(prepared.url, params)
+            except aiohttp.ClientError as exc:
+                if self._retry.max_attempts == 1:
+                    raise
+                if not self._retry.should_retry(attempt):
+                    raise RetryError(attempt, repr(exc)) from exc
+                resp = None
+            else:
+                if not self._retry.should_retry(attempt, resp):
+                    return resp
+            delay = self._retry.delay(attempt, resp)
+            LOGGER.warning("Attempt %s failed, retrying in %.2fs", attempt, delay)
+            await asyncio.sleep(delay)
+
+    async def _send(self, url: str, params: tuple) -> Response:
+        """Send one GET request."""
+        session = self._ensure_session()
+        async with self._semaphore:
+            if self._rate_limit is not None:
+                await self._rate_limit.acquire_async()
+            async with session.get(url, params=params) as resp:
+                body = await resp.read()
+                return utils.make_response(
+                    resp.status,
+                    body,
+                    headers=dict(resp.headers),
+                    url=str(resp.url),
+                    reason=resp.reason or "",
+                )
+
+    async def iter_pages(self, endpoint: Endpoint) -> AsyncIterator[Response]:
+        """
+        Iterate over every page of an endpoint (async).
+
+        After the first page, remaining pages are requested concurrently in
+        windows of ``2 * max_concurrency`` and yielded in offset order.
+
+        :param endpoint: The endpoint to page through.
+
+        :return: An async iterator of responses, one per page.
+        :rtype: AsyncIterator[Response]
+        """
+        first = await self.get(_page(endpoint, endpoint.params.offset))
+        yield first
+        offsets = list(_offsets(endpoint.params, _total(first)))
+        window = 2 * self._max_concurrency
+        for i in range(0, len(offsets), window):
+            pages = await asyncio.gather(
+                *(
+                    self.get(_page(endpoint, offset))
+                    for offset in offsets[i : i + window]
+                )
+            )
+            for page in pages:
+                yield page
+
+    async def get_all(self, endpoint: Endpoint, schema: dict = None) -> pd.DataFrame:
+        """
+        Get every page of an endpoint as a single dataframe (async).
+
+        :param endpoint: The endpoint to fetch.
+        :param schema: Column types to parse with (optional, see
+         :mod:`eia_client.parse`).
+
+        :return: A pandas dataframe containing all pages of requested data.
+        :rtype: pd.DataFrame
+        """
+        frames = [
+            parse.as_dataframe(resp, schema=schema)
+            async for resp in self.iter_pages(endpoint)
+        ]
+        return parse.concat(frames, schema=schema)
+
+    async def gather(self, endpoints: List[Endpoint]) -> List[pd.DataFrame]:
+        """
+        Get many endpoints concurrently (e.g. one TotalEnergy per MSN).
+
+        :param endpoints: The endpoints to fetch.
+
+        :return: One dataframe per endpoint, in the order given.
+        :rtype: List[pd.DataFrame]
+        """
+        return list(await asyncio.gather(*(self.get_all(e) for e in endpoints)))
@@ -0,0 +1,309 @@
+"""EIA client on-disk response cache module.
+
+Responses are stored zlib-compressed in a sqlite database keyed by a
+canonical hash of the endpoint route and query parameters (the API key is
+never part of the key). Entries expire after a per-route TTL and the least
+recently used entries are evicted once the store grows past its size cap.
+
+Expired entries are revalidated rather than refetched: their ``ETag`` and
+``Last-Modified`` validators are sent as ``If-None-Match`` and
+``If-Modified-Since`` so an unchanged resource costs a 304. When the server
+provides no validators a digest of the body tells whether a refetched
+response is unchanged, see :func:`is_unchanged`.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import zlib
+
+from requests import Response
+
+from eia_client import utils
+from eia_client.endpoint.builder import Endpoint
+
+
+FILE_BASE_NAME = ".eia.cache.sqlite"
+
+CACHE_HEADER = "X-EIA-Client-Cache"
+
+LOGGER = logging.getLogger(__name__)
+
+# Describe the wire format rather than the stored (decoded) body.
+_DROP_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    route TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+def get_default_cache_file_path() -> Path:
+    """
+    Get the default response cache file path.
+
+    :return: default Path to the cache database ("~/.eia.cache.sqlite").
+    :rtype: Path
+    """
+    return Path().home().joinpath(FILE_BASE_NAME)
+
+
+def route(endpoint: Endpoint) -> str:
+    """The endpoint url without any query string (or API key)."""
+    return endpoint.prepare().url
+
+
+def request_key(endpoint: Endpoint) -> str:
+    """
+    Canonical key of an endpoint request.
+
+    :param endpoint: The endpoint.
+
+    :return: A sha256 hex digest of the prepared request (route and
+     canonically ordered query parameters).
+    :rtype: str
+    """
+    return endpoint.prepare().key
+
+
+def _stored_headers(resp: Response) -> dict:
+    return {
+        name: value
+        for name, value in resp.headers.items()
+        if name.lower() not in _DROP_HEADERS and name != CACHE_HEADER
+    }
+
+
+def _response(row: tuple, status: str) -> Response:
+    """Build a response from a (route, status, headers, body, ...) row."""
+    headers = dict(json.loads(row[2]), **{CACHE_HEADER: status})
+    return utils.make_response(
+        row[1], zlib.decompress(row[3]), headers=headers, url=row[0], reason="OK"
+    )
+
+
+def is_unchanged(resp: Response) -> bool:
+    """
+    Whether a response is known to equal the previously cached response.
+
+    True for cache hits, 304 revalidations and refetched bodies whose
+    digest matches the stored one, so parsing can be skipped.
+
+    :param resp: A response returned by a client with a cache.
+    :rtype: bool
+    """
+    return resp.headers.get(CACHE_HEADER) in ("hit", "revalidated", "unchanged")
+
+
+@dataclass
+class CacheStats:
+    """
+    Response cache counters.
+
+    Every lookup counts as one of hits, misses (missing or expired) and
+    revalidated (expired, then confirmed unchanged by a 304).
+    """
+
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    unchanged: int = 0
+    evictions: int = 0
+
+
+class ResponseCache:
+    """
+    On-disk response cache.
+
+    :param file_path: The sqlite database file (optional, defaults to
+     "~/.eia.cache.sqlite").
+    :param ttl: Default time to live of an entry in seconds.
+    :param route_ttl: Per-route TTLs in seconds, keyed by route suffix
+     (e.g. {"/total-energy/data": 86400}).
+    :param max_bytes: Maximum size of stored (compressed) bodies.
+    """
+
+    def __init__(
+        self,
+        file_path: Path = None,
+        ttl: float = 3600,
+        route_ttl: dict = None,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.file_path = (
+            get_default_cache_file_path() if file_path is None else file_path
+        )
+        self.ttl = ttl
+        self.route_ttl = {} if route_ttl is None else route_ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(self.file_path), check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def ttl_for(self, route_str: str) -> float:
+        """Time to live of entries for a route."""
+        for suffix, ttl in self.route_ttl.items():
+            if route_str.endswith(suffix.rstrip("/")):
+                return ttl
+        return self.ttl
+
+    def get(self, endpoint: Endpoint) -> Response:
+        """
+        Get a fresh cached response for an endpoint.
+
+        :param endpoint: The endpoint.
+
+        :return: The cached response or None if missing or expired.
+        :rtype: Response
+        """
+        key = request_key(endpoint)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT route, status, headers, body, created FROM entries WHERE key=?",
+                (key,),
+            ).fetchone()
+            if row is None or now - row[4] > self.ttl_for(row[0]):
+                self.stats.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed=? WHERE key=?", (now, key))
+            self._conn.commit()
+            self.stats.hits += 1
+        return _response(row, "hit")
+
+    def conditional_headers(self, endpoint: Endpoint) -> dict:
+        """
+        Revalidation headers for a (stale) cached endpoint.
+
+        :param endpoint: The endpoint.
+
+        :return: "If-None-Match" and/or "If-Modified-Since" headers built from
+         the stored validators (empty if nothing is stored).
+        :rtype: dict
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM entries WHERE key=?",
+                (request_key(endpoint),),
+            ).fetchone()
+        headers = {}
+        if row is not None and row[0]:
+            headers["If-None-Match"] = row[0]
+        if row is not None and row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def revalidate(self, endpoint: Endpoint) -> Response:
+        """
+        Refresh a cached entry after a 304 (Not Modified) response.
+
+        :param endpoint: The endpoint.
+
+        :return: The cached response or None if the entry has been evicted.
+        :rtype: Response
+        """
+        key = request_key(endpoint)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT route, status, headers, body, created FROM entries WHERE key=?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE entries SET created=?, accessed=? WHERE key=?", (now, now, key)
+            )
+            self._conn.commit()
+            # The expired lookup was counted as a miss.
+            self.stats.misses = max(self.stats.misses - 1, 0)
+            self.stats.revalidated += 1
+        return _response(row, "revalidated")
+
+    def put(self, endpoint: Endpoint, resp: Response) -> None:
+        """
+        Store a successful response for an endpoint.
+
+        :param endpoint: The endpoint the response was requested with.
+        :param resp: The response (only status 200 responses are stored). If
+         its body digest equals the stored one it is marked unchanged.
+        """
+        if resp.status_code != 200:
+            return None
+        key = request_key(endpoint)
+        digest = hashlib.sha256(resp.content).hexdigest()
+        body = zlib.compress(resp.content)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM entries WHERE key=?", (key,)
+            ).fetchone()
+            if row is not None and row[0] == digest:
+                resp.headers[CACHE_HEADER] = "unchanged"
+                self.stats.unchanged += 1
+            self._conn.execute(
+                "REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    route(endpoint),
+                    resp.status_code,
+                    json.dumps(_stored_headers(resp)),
+                    body,
+                    len(body),
+                    digest,
+                    resp.headers.get("ETag"),
+                    resp.headers.get("Last-Modified"),
+                    now,
+                    now,
+                ),
+            )
+            self._evict()
+            self._conn.commit()
+        return None
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under max_bytes."""
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed")
+        evict = []
+        for key, size in rows.fetchall():
+            if total <= self.max_bytes:
+                break
+            evict.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key=?", evict)
+        self.stats.evictions += len(evict)
+        LOGGER.info("Evicted %s cache entries", len(evict))
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
@@ -1,19 +1,49 @@
 """Command line interface"""
 
+from __future__ import annotations
+
 from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter, Namespace
+from dataclasses import dataclass
 from pathlib import Path
+import json
 import logging
+import sys
+import time
 
-import pandas as pd
-
-from eia_client import parse
-from eia_client.client import Client
+from eia_client import utils
+from eia_client.endpoint.builder import EndpointBuilder
+from eia_client.endpoint.generic import endpoint_class
 from eia_client import endpoint as ec_endpoint
 import eia_client.api_key as ak
 
 
+# Deferred so commands that don't fetch data (e.g. config) start fast.
+pd = utils.LazyModule("pandas")
+parse = utils.LazyModule("eia_client.parse")
+ec_client = utils.LazyModule("eia_client.client")
+ec_metadata = utils.LazyModule("eia_client.metadata")
+ec_retry = utils.LazyModule("eia_client.retry")
+ec_store = utils.LazyModule("eia_client.store")
+
 LOGGER = logging.getLogger(__name__)
 
+BUILDERS = {
+    "total_energy": ec_endpoint.TotalEnergy,
+    "electricity_retail_sales": ec_endpoint.ElectricityRetailSales,
+}
+_JOB_KEYS = ("name", "endpoint", "route", "output_directory", "output_format")
+
+
+@dataclass
+class JobResult:
+    """Outcome of one batch job."""
+
+    name: str
+    rows: int = 0
+    seconds: float = 0.0
+    output: Path = None
+    error: Exception = None
+
 
 def _clean_command(command: str) -> str:
     return command.lower()
@@ -27,21 +57,25 @@ def _config_command() -> None:
     ak.write(ak.get_default_config_file_path(), ak.ApiKey(key))
 
 
-def _dataframe_writer(df: pd.DataFrame, args: Namespace, report_name: str) -> None:
-    if df.empty:
-        LOGGER.warning("Dataframe is empty. No data to write.")
-        return None
-    if args.output_directory is None:
-        output_directory = input("output directory (default='./')")
-        if not output_directory:
-            output_directory = "./"
-    else:
-        output_directory = args.output_directory
+def _write(
+    df: pd.DataFrame,
+    output_directory: Path,
+    output_format: str,
+    report_name: str,
+    route: str = None,
+    facets: tuple = (),
+) -> Path:
+    """Write a report, returning the file (or dataset directory) written."""
     output_directory = Path(output_directory)
     if not output_directory.exists():
         LOGGER.info("Created directory:%s", output_directory)
         output_directory.mkdir(parents=True)
-    if args.output_format == "parquet":
+    if output_format == "dataset":
+        store = ec_store.DatasetStore(output_directory)
+        store.write(df, route or report_name, facets=facets)
+        LOGGER.info("Shape:%s", df.shape)
+        return store.path(route or report_name)
+    if output_format == "parquet":
         file_ext = ".parquet"
     else:
         file_ext = ".csv"
@@ -52,9 +86,31 @@ def _dataframe_writer(df: pd.DataFrame, args: Namespace, report_name: str) -> No
         df.to_csv(output_file_path)
     LOGGER.info("Shape:%s", df.shape)
     LOGGER.info("Wrote:%s", output_file_path)
+    return output_file_path
+
+
+def _dataframe_writer(
+    df: pd.DataFrame,
+    args: Namespace,
+    report_name: str,
+    route: str = None,
+    facets: tuple = (),
+) -> None:
+    if df.empty:
+        LOGGER.warning("Dataframe is empty. No data to write.")
+        return None
+    if args.output_directory is None:
+        output_directory = input("output directory (default='./')")
+        if not output_directory:
+            output_directory = "./"
+    else:
+        output_directory = args.output_directory
+    _write(df, output_directory, args.output_format, report_name, route, facets)
 
 
-def _total_energy_monthly_report(client: Client, api_key: ak.ApiKey, args: Namespace):
+def _total_energy_monthly_report(
+    client: ec_client.Client, api_key: ak.ApiKey, args: Namespace
+):
     msn = input("msn (default: ELETPUS; optional):")
     start = input("start (form: YYYY-MM; optional):")
     end = input("end (form: YYYY-MM; optional):")
@@ -72,10 +128,16 @@ def _total_energy_monthly_report(client: Client, api_key: ak.ApiKey, args: Names
     )
     resp = client.get(endpoint.build())
     tem_df = parse.as_dataframe(resp)
-    _dataframe_writer(tem_df, args, report_name="total_energy_monthly")
+    _dataframe_writer(
+        tem_df,
+        args,
+        report_name="total_energy_monthly",
+        route=endpoint.ENDPOINT,
+        facets=endpoint.FACETS,
+    )
 
 
-def _electricity_retail_sales(client: Client, api_key: ak.ApiKey):
+def _electricity_retail_sales(client: ec_client.Client, api_key: ak.ApiKey):
     # TODO: feature: add electricity reatail sales report
     LOGGER.warning("Electricity sales not yet implemented.")
 
@@ -85,13 +147,116 @@ def _report_command(api_key: ak.ApiKey, args: Namespace):
     if not report_to_run:
         report_to_run = "total_energy_monthly"
     LOGGER.info("Running report:%s", report_to_run)
-    client = Client()
+    client = ec_client.Client()
     if report_to_run == "total_energy_monthly":
         _total_energy_monthly_report(client, api_key, args)
     elif report_to_run == "electricity-retail-sales":
         _electricity_retail_sales(client, api_key)
 
 
+def _load_manifest(file_path: Path) -> dict:
+    """Load a JSON or TOML (.toml) batch manifest."""
+    file_path = Path(file_path)
+    if file_path.suffix == ".toml":
+        try:
+            import tomllib  # pylint: disable=import-outside-toplevel
+        except ImportError:  # pragma: no cover
+            import tomli as tomllib  # pylint: disable=import-outside-toplevel
+        with open(file_path, "rb") as manifest_file:
+            return tomllib.load(manifest_file)
+    return json.loads(file_path.read_text(encoding="utf-8"))
+
+
+def _job_builder(
+    job: dict, api_key: ak.ApiKey, base: str = None, catalog=None
+) -> EndpointBuilder:
+    """The endpoint builder of a manifest job (other keys are its arguments)."""
+    kwargs = {k: v for k, v in job.items() if k not in _JOB_KEYS}
+    if "route" in job:
+        builder_class = endpoint_class(job["route"], catalog)
+    elif job.get("endpoint") in BUILDERS:
+        builder_class = BUILDERS[job["endpoint"]]
+    else:
+        raise RuntimeError(f"Invalid endpoint:{job.get('endpoint')}")
+    builder = builder_class(api_key=api_key, **kwargs)
+    if base is not None:
+        builder.BASE = base
+    return builder
+
+
+def _run_job(
+    client: ec_client.Client,
+    job: dict,
+    api_key: ak.ApiKey,
+    defaults: dict,
+    base: str = None,
+    catalog=None,
+) -> JobResult:
+    """Fetch and write one manifest job, recording its timing or error."""
+    start = time.perf_counter()
+    name = job["name"]
+    try:
+        builder = _job_builder(job, api_key, base, catalog)
+        data_df = client.get_all(builder.build(), max_workers=1)
+        output = None
+        if data_df.empty:
+            LOGGER.warning("Job %s: no data to write.", name)
+        else:
+            output = _write(
+                data_df,
+                job.get("output_directory", defaults["output_directory"]),
+                job.get("output_format", defaults["output_format"]),
+                name,
+                route=builder.ENDPOINT,
+                facets=builder.FACETS,
+            )
+        seconds = time.perf_counter() - start
+        return JobResult(name, data_df.shape[0], seconds, output)
+    except Exception as exc:  # pylint: disable=broad-except
+        LOGGER.error("Job %s failed:%s", name, exc)
+        return JobResult(name, seconds=time.perf_counter() - start, error=exc)
+
+
+def _batch_command(api_key: ak.ApiKey, args: Namespace) -> list:
+    """Run every job of a manifest concurrently."""
+    if args.manifest is None:
+        raise RuntimeError("The batch command requires --manifest")
+    manifest = _load_manifest(args.manifest)
+    defaults = {
+        "output_directory": args.output_directory or "./",
+        "output_format": args.output_format,
+        **manifest.get("defaults", {}),
+    }
+    workers = args.workers or manifest.get("workers", 4)
+    jobs = [
+        dict(job, name=job.get("name", f"job{i}"))
+        for i, job in enumerate(manifest.get("jobs", []))
+    ]
+    client = ec_client.Client(
+        api_key=api_key, max_workers=workers, retry=ec_retry.RetryPolicy()
+    )
+    base = manifest.get("base")
+    # Route jobs are described by metadata fetched with this client and key.
+    catalog = ec_metadata.Catalog(client, base=base or EndpointBuilder.BASE)
+    LOGGER.info("Running %s jobs with %s workers", len(jobs), workers)
+    results = list(
+        utils.ordered_map(
+            lambda job: _run_job(client, job, api_key, defaults, base, catalog),
+            jobs,
+            max_workers=workers,
+        )
+    )
+    for result in results:
+        LOGGER.info(
+            "Job:%s rows:%s seconds:%.2f %s",
+            result.name,
+            result.rows,
+            result.seconds,
+            "failed" if result.error is not None else result.output,
+        )
+    return results
+
+
 def _process_args(args: ArgumentParser):
     """Process the cli command."""
     command = _clean_command(args.command)
@@ -100,6 +265,10 @@ def _process_args(args: ArgumentParser):
     api_key = ak.load(config_file_path=args.api_key)
     if command == "report":
         _report_command(api_key, args)
+    if command == "batch":
+        results = _batch_command(api_key, args)
+        if any(result.error is not None for result in results):
+            sys.exit(1)
 
 
 def cli() -> None:
@@ -110,20 +279,29 @@ def cli() -> None:
         formatter_class=ArgumentDefaultsHelpFormatter,
     )
     arg_parser.add_argument(
-        "command", choices=("config", "report"), help="Command to run."
+        "command", choices=("config", "report", "batch"), help="Command to run."
     )
     arg_parser.add_argument(
         "-k", "--api-key", default=None, help="Optional API key file path."
     )
     arg_parser.add_argument(
         "--output-format",
-        choices=("csv", "parquet"),
+        choices=("csv", "parquet", "dataset"),
         default="parquet",
-        help="Output format.",
+        help="Output format (dataset: partitioned parquet, merged on rerun).",
     )
     arg_parser.add_argument(
         "--output-directory", default=None, help="Output directory."
     )
+    arg_parser.add_argument(
+        "--manifest", default=None, help="Batch manifest (JSON or TOML) path."
+    )
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Batch jobs run concurrently (default: manifest workers or 4).",
+    )
     _process_args(arg_parser.parse_args())
 
 
@@ -1,29 +1,564 @@
 """EIA client module."""
 
-from dataclasses import asdict
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, replace
+from typing import Iterator, List, Mapping, Union
 import json
+import logging
+import time
 
-from requests import Session
+from requests import RequestException, Response, Session
+from requests.adapters import HTTPAdapter
 
 from eia_client import api_key as ak
-from eia_client.endpoint.builder import Endpoint, EndpointParams, join_api_key
+from eia_client import instrument
+from eia_client import parse
+from eia_client import planner
+from eia_client.cache import ResponseCache, request_key
+from eia_client.exceptions import RetryError, for_status
+from eia_client.rate_limit import TokenBucket
+from eia_client.result_cache import ResultCache
+from eia_client.retry import RetryPolicy
+from eia_client.singleflight import SingleFlight
+from eia_client import utils
+from eia_client.endpoint.builder import Endpoint, EndpointParams, PreparedRequest
+
+
+pd = utils.LazyModule("pandas")
+pa = utils.LazyModule("pyarrow")
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _page(endpoint: Endpoint, offset: int) -> Endpoint:
+    """Copy of an endpoint pointing at the page starting at offset."""
+    return Endpoint(endpoint.endpoint, replace(endpoint.params, offset=offset))
+
+
+def _session(max_workers: int) -> Session:
+    """A session whose connection pool fits max_workers concurrent requests."""
+    session = Session()
+    adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _total(resp: Response) -> int:
+    """Total number of rows reported by the first page of a response."""
+    if resp.status_code != 200:
+        return 0
+    return parse.response_total(resp.content)
+
+
+def _transfer(resp: Response, sent: float, stream: bool) -> dict:
+    """Latency (to the headers), download time and size of a response."""
+    latency = resp.elapsed.total_seconds()
+    if stream:
+        return {"latency": latency, "bytes": int(resp.headers.get("Content-Length", 0))}
+    download = max(time.perf_counter() - sent - latency, 0.0)
+    return {"latency": latency, "download": download, "bytes": len(resp.content)}
+
+
+def _schema_key(schema: dict) -> str:
+    return json.dumps(schema, sort_keys=True)
+
+
+def _offsets(params: EndpointParams, total: int) -> range:
+    """Offsets of the pages remaining after the first page."""
+    length = max(params.length, 1)
+    return range(params.offset + length, total, length)
 
 
-def _headers(params: EndpointParams) -> dict:
-    return {"X-Params": json.dumps(asdict(params))}
+@dataclass
+class BatchResult:
+    """
+    Result of one query of :meth:`Client.get_many`.
+
+    :param data: The data (None if the query failed).
+    :param error: The error raised while fetching the query (None on success).
+    """
+
+    data: pd.DataFrame = None
+    error: Exception = None
 
 
 class Client:
     """
     EIA Client class.
+
+    :param session: A requests session (optional). When not provided a session
+     is created with a connection pool sized to max_workers.
+    :param api_key: ApiKey data class (optional, loaded if not provided).
+    :param max_workers: Number of pages fetched concurrently when paginating.
+     Per-call max_workers are capped to it, since it sizes the connection
+     pool of the session the client creates.
+    :param cache: A response cache (optional). When provided, fresh cached
+     responses are returned without a request, stale ones are revalidated
+     with conditional requests and successful responses are stored
+     (except streamed ones, storing them would download the whole body).
+    :param retry: A retry policy (optional). When provided, requests (and so
+     each page when paginating) failing with a transient status or a
+     connection error are retried with backoff.
+    :param rate_limit: A token bucket (optional) every request (including
+     retries) waits on, e.g. :func:`eia_client.rate_limit.shared`.
+    :param coalesce: Share one request (and one parsed result) between
+     concurrent identical calls to :meth:`get`, :meth:`get_all` and
+     :meth:`get_all_arrow`.
+    :param hooks: Instrumentation hooks called with the timings, sizes and
+     cache results of requests and parsing (optional, see
+     :mod:`eia_client.instrument`).
+    :param parse_pool: An executor (e.g. a ``ProcessPoolExecutor``) that
+     :meth:`get_all`, :meth:`get_all_arrow` and the methods built on them parse
+     pages in (optional). Raw bodies are sent to the pool and parsed pages
+     come back as Arrow IPC buffers (see :func:`eia_client.parse.as_ipc`), so
+     parsing scales across cores while pages download. Pages are then not
+     streamed.
+    :param result_cache: An in-memory cache of parsed results (optional, may
+     be shared between clients). When provided, :meth:`get_all` and
+     :meth:`get_all_arrow` (and the methods built on them) return fresh
+     cached results without requesting or parsing, and cache what they
+     fetch.
     """
 
-    def __init__(self, session: Session = None, api_key: ak.ApiKey = None):
-        self._session = Session() if session is None else session
+    def __init__(
+        self,
+        session: Session = None,
+        api_key: ak.ApiKey = None,
+        max_workers: int = 1,
+        cache: ResponseCache = None,
+        retry: RetryPolicy = None,
+        rate_limit: TokenBucket = None,
+        coalesce: bool = False,
+        hooks: list = None,
+        parse_pool: Executor = None,
+        result_cache: ResultCache = None,
+    ):
+        self._max_workers = max(max_workers, 1)
+        self._session = _session(self._max_workers) if session is None else session
         self._api_key = ak.load() if api_key is None else api_key
+        self._cache = cache
+        self._retry = RetryPolicy(max_attempts=1) if retry is None else retry
+        self._rate_limit = rate_limit
+        self._flight = SingleFlight() if coalesce else None
+        self._hooks = list(hooks or [])
+        self._parse_pool = parse_pool
+        self._result_cache = result_cache
+
+    def add_hook(self, hook) -> None:
+        """Add an instrumentation hook (see :mod:`eia_client.instrument`)."""
+        self._hooks.append(hook)
+
+    def get(self, endpoint: Endpoint, stream: bool = False):
+        """
+        EIA Client get endpoint.
+
+        :param endpoint: The endpoint to request.
+        :param stream: Don't download the body up front, so it can be parsed
+         incrementally (see :func:`eia_client.parse.iter_batches`). Streamed
+         responses are served from the response cache but not stored in it.
+        """
+        if stream:
+            return self._get(endpoint, stream)
+        key = ("get", request_key(endpoint))
+        return self._coalesced(key, lambda: self._get(endpoint, stream))[0]
+
+    def get_url(self, url: str) -> Response:
+        """
+        GET an API url without query parameters (e.g. route metadata).
+
+        Retries and rate limiting apply, the response cache doesn't.
+
+        :param url: The url (e.g. "https://api.eia.gov/v2/total-energy").
+        """
+        return self._send(PreparedRequest(url.rstrip("/"), ()), {}, False)
+
+    def _get(self, endpoint: Endpoint, stream: bool) -> Response:
+        if self._cache is None:
+            return self._send(endpoint.prepare(), {}, stream)
+        started = time.perf_counter()
+        resp = self._cache.get(endpoint)
+        result = "hit"
+        if resp is None:
+            headers = self._cache.conditional_headers(endpoint)
+            resp = self._send(endpoint.prepare(), headers, stream)
+            result = "miss"
+            cached = None
+            if resp.status_code == 304:
+                cached = self._cache.revalidate(endpoint)
+                if cached is None:  # Evicted since the validators were read.
+                    resp.close()
+                    resp = self._send(endpoint.prepare(), {}, stream)
+            if cached is not None:
+                resp, result = cached, "revalidated"
+            elif not stream:
+                self._cache.put(endpoint, resp)
+        self._emit("cache", started, url=endpoint.prepare().url, result=result)
+        return resp
+
+    def _send(
+        self, prepared: PreparedRequest, headers: dict, stream: bool
+    ) -> Response:
+        """Send a GET request, instrumented when there are hooks."""
+        details = {"url": prepared.url, "attempts": 0, "throttled": 0.0}
+        if not self._hooks:
+            return self._send_with_retries(prepared, headers, stream, details)
+        started = time.perf_counter()
+        try:
+            resp = self._send_with_retries(prepared, headers, stream, details)
+        except Exception as exc:
+            self._emit("request", started, error=type(exc).__name__, **details)
+            raise
+        self._emit("request", started, status=resp.status_code, **details)
+        return resp
+
+    def _send_with_retries(
+        self, prepared: PreparedRequest, headers: dict, stream: bool, details: dict
+    ) -> Response:
+        """Send a GET request, retrying transient failures."""
+        params = prepared.with_api_key(self._api_key)
+        attempt = 0
+        while True:
+            attempt += 1
+            details["attempts"] = attempt
+            if self._rate_limit is not None:
+                details["throttled"] += self._rate_limit.acquire()
+            sent = time.perf_counter()
+            try:
+                resp = self._session.get(
+                    prepared.url, params=params, headers=headers, stream=stream
+                )
+            except RequestException as exc:
+                if self._retry.max_attempts == 1:
+                    raise
+                if not self._retry.should_retry(attempt):
+                    raise RetryError(attempt, repr(exc)) from exc
+                resp = None
+            else:
+                if not self._retry.should_retry(attempt, resp):
+                    if self._hooks:
+                        details.update(_transfer(resp, sent, stream))
+                    return resp
+                resp.close()
+            delay = self._retry.delay(attempt, resp)
+            LOGGER.warning(
+                "Attempt %s failed (status:%s), retrying in %.2fs",
+                attempt,
+                None if resp is None else resp.status_code,
+                delay,
+            )
+            time.sleep(delay)
+
+    def iter_pages(
+        self, endpoint: Endpoint, max_workers: int = None
+    ) -> Iterator[Response]:
+        """
+        Iterate over every page of an endpoint.
+
+        The first page is requested at the endpoint's offset and its
+        ``response.total`` is used to compute the offsets of the remaining
+        pages, which are requested (``length`` rows at a time) as the
+        iterator is consumed. With more than one worker the remaining pages
+        are fetched concurrently over the shared session and yielded in
+        offset order.
+
+        :param endpoint: The endpoint to page through.
+        :param max_workers: Pages fetched concurrently (defaults to, and at
+         most, the client's max_workers).
+
+        :return: An iterator of responses, one per page.
+        :rtype: Iterator[Response]
+        """
+        return self._map_pages(endpoint, lambda resp: resp, max_workers=max_workers)
+
+    def _workers(self, max_workers: int = None) -> int:
+        """Per-call workers, capped to the connection pool size."""
+        if max_workers is None:
+            return self._max_workers
+        return max(min(max_workers, self._max_workers), 1)
+
+    def _map_pages(
+        self, endpoint: Endpoint, func, max_workers: int = None, stream: bool = False
+    ) -> Iterator:
+        """Apply func to every page (remaining pages in worker threads)."""
+        first = self.get(_page(endpoint, endpoint.params.offset))
+        total = _total(first)
+        yield func(first)
+        max_workers = self._workers(max_workers)
+        yield from utils.ordered_map(
+            lambda offset: func(self.get(_page(endpoint, offset), stream=stream)),
+            _offsets(endpoint.params, total),
+            max_workers=max_workers,
+        )
+
+    def get_all(
+        self,
+        endpoint: Endpoint,
+        max_workers: int = None,
+        schema: dict = None,
+        stream: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Get every page of an endpoint as a single dataframe.
+
+        Each page is parsed by the worker that fetched it, so only a small
+        window of raw response bodies is held in memory at a time. With
+        stream the pages after the first are parsed incrementally as they
+        download and their raw bodies are never held in full (so they are
+        not stored in the response cache either).
+
+        :param endpoint: The endpoint to fetch.
+        :param max_workers: Pages fetched concurrently (defaults to, and at
+         most, the client's max_workers).
+        :param schema: Column types to parse with (optional, see
+         :mod:`eia_client.parse`).
+        :param stream: Stream and incrementally parse page bodies.
+
+        :return: A pandas dataframe containing all pages of requested data.
+        :rtype: pd.DataFrame
+        """
+        key = ("get_all", request_key(endpoint), _schema_key(schema))
+        cached = self._cached_result(endpoint, key)
+        if cached is not None:
+            return cached
+        data_df, shared = self._coalesced(
+            (*key, stream),
+            lambda: self._cache_result(
+                key,
+                parse.concat(
+                    self._parse_pages(
+                        endpoint, parse.as_dataframe, max_workers, schema, stream
+                    ),
+                    schema=schema,
+                ),
+            ),
+        )
+        return data_df.copy() if shared else data_df
+
+    def get_all_arrow(
+        self,
+        endpoint: Endpoint,
+        max_workers: int = None,
+        schema: dict = None,
+        stream: bool = False,
+    ) -> pa.Table:
+        """
+        Get every page of an endpoint as a single Arrow table.
+
+        Like :meth:`get_all`, but pages are parsed straight into Arrow (see
+        :func:`eia_client.parse.as_arrow`) and concatenated without copying.
+
+        :param endpoint: The endpoint to fetch.
+        :param max_workers: Pages fetched concurrently (defaults to, and at
+         most, the client's max_workers).
+        :param schema: Column types to parse with (optional, see
+         :mod:`eia_client.parse`).
+        :param stream: Stream and incrementally parse page bodies.
+
+        :return: An Arrow table containing all pages of requested data.
+        :rtype: pa.Table
+        """
+        key = ("get_all_arrow", request_key(endpoint), _schema_key(schema))
+        cached = self._cached_result(endpoint, key)
+        if cached is not None:
+            return cached
+        return self._coalesced(
+            (*key, stream),
+            lambda: self._cache_result(
+                key,
+                parse.concat_tables(
+                    self._parse_pages(
+                        endpoint, parse.as_arrow, max_workers, schema, stream
+                    )
+                ),
+            ),
+        )[0]
+
+    def get_shards(
+        self,
+        shards: List[Endpoint],
+        max_workers: int = None,
+        schema: dict = None,
+        stream: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Get the shards of a split query as a single dataframe.
+
+        Shards (see :func:`eia_client.planner.plan`) are fetched concurrently,
+        each paginated on its own, and stitched back together in the sort
+        order of the original query.
+
+        :param shards: The shards to fetch.
+        :param max_workers: Shards fetched concurrently (defaults to, and at
+         most, the client's max_workers).
+        :param schema: Column types to parse with (optional, see
+         :mod:`eia_client.parse`).
+        :param stream: Stream and incrementally parse page bodies.
+
+        :return: A pandas dataframe containing the data of every shard.
+        :rtype: pd.DataFrame
+        """
+        max_workers = self._workers(max_workers)
+        frames = utils.ordered_map(
+            lambda shard: self.get_all(shard, 1, schema=schema, stream=stream),
+            shards,
+            max_workers=max_workers,
+        )
+        sort = shards[0].params.sort if shards else None
+        return planner.stitch(list(frames), sort=sort, schema=schema)
+
+    def get_many(
+        self,
+        endpoints: Union[Mapping, List[Endpoint]],
+        max_workers: int = None,
+        schema: dict = None,
+        max_merged: int = 100,
+    ) -> dict:
+        """
+        Get many endpoints in one call.
+
+        Identical queries are requested once and queries differing only in
+        one facet's values (e.g. one TotalEnergy per MSN) are merged into a
+        single query whose result is split back by facet value (see
+        :func:`eia_client.planner.merge`). The resulting queries are fetched
+        concurrently over the shared session.
+
+        :param endpoints: The endpoints, as a list or a mapping of key to
+         endpoint.
+        :param max_workers: Queries fetched concurrently (defaults to, and at
+         most, the client's max_workers).
+        :param schema: Column types to parse with (optional, see
+         :mod:`eia_client.parse`).
+        :param max_merged: Maximum number of queries merged into one query.
+
+        :return: A result (data or error) per input, keyed like the input
+         (list indices for a list).
+        :rtype: dict
+        """
+        if not isinstance(endpoints, Mapping):
+            endpoints = dict(enumerate(endpoints))
+        keys = list(endpoints)
+        queries = planner.merge([endpoints[key] for key in keys], max_merged)
+
+        def fetch(query: planner.MergedQuery):
+            try:
+                return self.get_all(query.endpoint, 1, schema=schema), None
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning("Query failed:%s", exc)
+                return None, exc
+
+        max_workers = self._workers(max_workers)
+        results = {}
+        for query, (data_df, error) in zip(
+            queries, utils.ordered_map(fetch, queries, max_workers=max_workers)
+        ):
+            for member in query.members:
+                key = keys[member]
+                if error is not None:
+                    results[key] = BatchResult(error=error)
+                elif query.facet is None:
+                    results[key] = BatchResult(data=data_df.copy())
+                elif query.facet not in data_df:
+                    # No rows: the merged result has no facet column to split.
+                    results[key] = BatchResult(data=data_df.iloc[:0].copy())
+                else:
+                    values = endpoints[key].params.facets[query.facet]
+                    member_df = data_df[data_df[query.facet].isin(values)]
+                    results[key] = BatchResult(data=member_df.reset_index(drop=True))
+        return {key: results[key] for key in keys}
+
+    def _cached_result(self, endpoint: Endpoint, key: tuple):
+        """A fresh result from the result cache (None on a miss or no cache)."""
+        if self._result_cache is None:
+            return None
+        started = time.perf_counter()
+        result = self._result_cache.get(key)
+        self._emit(
+            "result_cache",
+            started,
+            url=endpoint.prepare().url,
+            result="miss" if result is None else "hit",
+        )
+        return result
+
+    def _cache_result(self, key: tuple, result):
+        """Store a parsed result in the result cache (if any), return it."""
+        if self._result_cache is not None:
+            self._result_cache.put(key, result)
+        return result
+
+    def _parse_pages(
+        self, endpoint: Endpoint, parser, max_workers: int, schema: dict, stream: bool
+    ) -> list:
+        """Fetch and parse every page of an endpoint."""
+        if self._parse_pool is not None:
+            return self._parse_pages_in_pool(endpoint, parser, max_workers, schema)
+
+        def parse_page(resp: Response):
+            if not self._hooks:
+                return parser(resp, schema=schema, stream=stream)
+            started = time.perf_counter()
+            timings = {}
+            page = parser(resp, schema=schema, stream=stream, timings=timings)
+            rows = page.num_rows if isinstance(page, pa.Table) else page.shape[0]
+            self._emit("parse", started, parser=parser.__name__, rows=rows, **timings)
+            return page
+
+        pages = list(
+            self._map_pages(
+                endpoint, parse_page, max_workers=max_workers, stream=stream
+            )
+        )
+        LOGGER.info("Fetched %s pages from:%s", len(pages), endpoint.endpoint)
+        return pages
+
+    def _parse_pages_in_pool(
+        self, endpoint: Endpoint, parser, max_workers: int, schema: dict
+    ) -> list:
+        """
+        Fetch every page, parsing the bodies in the parse pool.
+
+        Like :func:`eia_client.utils.ordered_map`, at most ``2 * max_workers``
+        bodies are submitted and not yet read back at any time, so raw bodies
+        don't pile up in the pool's queue.
+        """
+        dataframe = parser is parse.as_dataframe
+        max_workers = self._workers(max_workers)
+        window = 2 * max(max_workers, 1)
+
+        def submit(resp: Response) -> Future:
+            if resp.status_code != 200:
+                resp.close()
+                raise for_status(resp.status_code, resp.reason, resp.url)
+            body = resp.content
+            return self._parse_pool.submit(parse.as_ipc, body, schema, dataframe)
+
+        tables = []
+        pending = deque()
+        for future in self._map_pages(endpoint, submit, max_workers=max_workers):
+            if len(pending) >= window:
+                tables.append(parse.read_ipc(pending.popleft().result()))
+            pending.append(future)
+        while pending:
+            tables.append(parse.read_ipc(pending.popleft().result()))
+        LOGGER.info("Fetched %s pages from:%s", len(tables), endpoint.endpoint)
+        if dataframe:
+            # One conversion of the concatenated table rather than one per page.
+            return [parse.concat_tables(tables).to_pandas()]
+        return tables
+
+    def _emit(self, name: str, started: float, **attributes) -> None:
+        """Call the hooks with an event started at started (perf_counter)."""
+        if self._hooks:
+            duration = time.perf_counter() - started
+            event = instrument.Event(name, time.time() - duration, duration, attributes)
+            instrument.emit(self._hooks, event)
 
-    def get(self, endpoint: Endpoint):
-        """EIA Client get endpoint."""
-        endpoint = join_api_key(endpoint, self._api_key)
-        headers = _headers(endpoint.params)
-        return self._session.get(endpoint.endpoint, headers=headers)
+    def _coalesced(self, key: tuple, func) -> tuple:
+        """Run func, shared with concurrent identical calls when coalescing."""
+        if self._flight is None:
+            return func(), False
+        return self._flight.do(key, func)
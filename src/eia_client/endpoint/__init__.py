@@ -1,4 +1,26 @@
-"""eia_clients.endpoints package"""
+"""eia_clients.endpoints package
+
+Besides the hand-written builders, a builder class can be generated for any
+route (see :func:`eia_client.endpoint.generic.endpoint_class`). The routes in
+``ROUTES`` are also available as attributes of this package, created on first
+access (e.g. ``endpoint.ElectricityRtoRegionData``).
+"""
 
 from eia_client.endpoint.total_energy import TotalEnergy
 from eia_client.endpoint.electricity_retail_sales import ElectricityRetailSales
+from eia_client.endpoint.generic import GenericEndpoint, endpoint_class
+
+
+ROUTES = {
+    "ElectricityRtoRegionData": "electricity/rto/region-data",
+    "ElectricityRtoFuelTypeData": "electricity/rto/fuel-type-data",
+    "ElectricityRtoInterchangeData": "electricity/rto/interchange-data",
+    "NaturalGasPriceSummary": "natural-gas/pri/sum",
+    "PetroleumSpotPrices": "petroleum/pri/spt",
+}
+
+
+def __getattr__(name: str) -> type:
+    if name in ROUTES:
+        return endpoint_class(ROUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
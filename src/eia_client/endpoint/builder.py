@@ -1,6 +1,8 @@
 """A module for interacting with the EIA Open Data API."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+from typing import Tuple
+import hashlib
 import logging
 
 from eia_client import api_key as ak
@@ -9,7 +11,7 @@ from eia_client import api_key as ak
 LOGGER = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True)
 class EndpointParams:
     """
     API Endpoint parameters.
@@ -28,7 +30,58 @@ class EndpointParams:
     length: int
 
 
-@dataclass
+@dataclass(frozen=True)
+class PreparedRequest:
+    """
+    Prepared API request.
+
+    The immutable, hashable form of an endpoint: its url and its query
+    parameters in canonical order, without the API key (which is only added
+    when the request is sent).
+    """
+
+    url: str
+    query: Tuple[Tuple[str, str], ...]
+
+    @property
+    def key(self) -> str:
+        """A sha256 hex digest identifying the request."""
+        payload = "&".join(f"{name}={value}" for name, value in self.query)
+        return hashlib.sha256(f"{self.url}?{payload}".encode("utf-8")).hexdigest()
+
+    def with_api_key(self, api_key: ak.ApiKey) -> Tuple[Tuple[str, str], ...]:
+        """The query parameters including the API key."""
+        return self.query + (("api_key", api_key.key),)
+
+
+def encode_params(params: EndpointParams) -> Tuple[Tuple[str, str], ...]:
+    """
+    Encode endpoint parameters as EIA v2 url query parameters.
+
+    Facets are ordered by name and facet values sorted so equivalent queries
+    encode identically, e.g. ``facets[msn][]=ELETPUS``, ``data[0]=value`` and
+    ``sort[0][column]=period``.
+
+    :param params: The endpoint parameters.
+
+    :return: (name, value) pairs in canonical order.
+    :rtype: Tuple[Tuple[str, str], ...]
+    """
+    query = [("frequency", params.frequency)]
+    query += [(f"data[{i}]", column) for i, column in enumerate(params.data)]
+    for facet in sorted(params.facets):
+        query += [(f"facets[{facet}][]", v) for v in sorted(params.facets[facet])]
+    if params.start is not None:
+        query.append(("start", params.start))
+    if params.end is not None:
+        query.append(("end", params.end))
+    for i, sort in enumerate(params.sort):
+        query += [(f"sort[{i}][{name}]", sort[name]) for name in sorted(sort)]
+    query += [("offset", str(params.offset)), ("length", str(params.length))]
+    return tuple((name, str(value)) for name, value in query)
+
+
+@dataclass(frozen=True)
 class Endpoint:
     """
     API endpoint.
@@ -38,13 +91,29 @@ class Endpoint:
 
     endpoint: str
     params: EndpointParams
+    _prepared: PreparedRequest = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
+    def prepare(self) -> PreparedRequest:
+        """The prepared request (encoded once per endpoint)."""
+        if self._prepared is None:
+            url = self.endpoint.split("?")[0].rstrip("/")
+            prepared = PreparedRequest(url, encode_params(self.params))
+            object.__setattr__(self, "_prepared", prepared)
+        return self._prepared
 
 
-def join_api_key(endpoint: Endpoint, api_key: ak.ApiKey):
-    """Join an endpoint and API key (required for all requests to API)."""
-    endpoint.endpoint = f"{endpoint.endpoint}/?api_key={api_key.key}"
-    return endpoint
+def join_api_key(endpoint: Endpoint, api_key: ak.ApiKey) -> Endpoint:
+    """
+    Join an endpoint and API key (required for all requests to API).
+
+    Returns a new endpoint; the given endpoint is left unchanged. The client
+    doesn't need this: it adds the key to the prepared request's query
+    parameters when sending.
+    """
+    url = endpoint.endpoint.split("?")[0].rstrip("/")
+    return replace(endpoint, endpoint=f"{url}/?api_key={api_key.key}")
 
 
 class EndpointBuilder:
@@ -67,6 +136,8 @@ class EndpointBuilder:
 
     BASE = "https://api.eia.gov/v2"
     ENDPOINT = ""
+    FACETS = ()
+    SCHEMA = {"period": "period"}
     SORT = [{"column": "period", "direction": "desc"}]
 
     def __init__(
@@ -120,11 +191,19 @@ class EndpointBuilder:
             length=length,
         )
 
-    def build(self, **kwargs) -> Endpoint:
-        """Build the endpoint."""
+    def build(self, catalog=None, **kwargs) -> Endpoint:
+        """
+        Build the endpoint.
+
+        :param catalog: A :class:`eia_client.metadata.Catalog` to validate the
+         endpoint against (optional).
+        """
         endpoint_str = f"{self.BASE}{self.ENDPOINT}"
         # TODO: feature: ability to update params via kwargs and rebuild
-        self._endpoint = Endpoint(endpoint_str, self._params)
+        endpoint = Endpoint(endpoint_str, self._params)
+        if catalog is not None:
+            catalog.validate(endpoint)
+        self._endpoint = endpoint
         return self._endpoint
 
     @property
@@ -27,6 +27,22 @@ class ElectricityRetailSales(EndpointBuilder):
         "annual",
     )
     VALID_DATA = ("customers", "price", "revenue", "sales")
+    FACETS = ("stateid", "sectorid")
+    SCHEMA = {
+        "period": "period",
+        "stateid": "category",
+        "stateDescription": "category",
+        "sectorid": "category",
+        "sectorName": "category",
+        "customers": "int",
+        "price": "float",
+        "revenue": "float",
+        "sales": "float",
+        "customers-units": "category",
+        "price-units": "category",
+        "revenue-units": "category",
+        "sales-units": "category",
+    }
     ENDPOINT = "/electricity/retail-sales/data"
 
     def __init__(
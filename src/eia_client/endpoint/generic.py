@@ -0,0 +1,137 @@
+"""
+EIA Client generic endpoint builders.
+
+Builders for any EIA v2 route, generated from the route's metadata (see
+:mod:`eia_client.metadata`) instead of written by hand. Classes are created on
+first use and reused, so only the routes actually used are described::
+
+    RegionData = endpoint_class("electricity/rto/region-data")
+    builder = RegionData(frequency="hourly", respondent="CISO", type="D")
+
+"""
+
+from eia_client import utils
+from eia_client.api_key import ApiKey
+from eia_client.endpoint.builder import Endpoint, EndpointBuilder
+from eia_client.exceptions import ValidationError
+
+
+_CLASSES = {}
+_CATALOG = None
+
+
+def class_name(route: str) -> str:
+    """CamelCase class name of a route (e.g. "ElectricityRtoRegionData")."""
+    words = route.replace("/", "-").split("-")
+    return "".join(word[:1].upper() + word[1:] for word in words if word)
+
+
+class GenericEndpoint(EndpointBuilder):
+    """Generic endpoint builder, see :func:`endpoint_class`.
+
+    :param api_key: ApiKey data class
+    :param frequency: The frequency of data to return (default: the route's
+     default frequency).
+    :param data: The data columns to return (default: every data column).
+    :param start: Start date (form depends on frequency)
+    :param end: End date (form depends on frequency)
+    :param sort: Server-side sorting on return.
+    :param offset: Offset
+    :param length: Number of observations to return (5000 max)
+    :param facets: Facet filters by facet id (e.g. respondent="CISO").
+    """
+
+    ROUTE = ""
+    VALID_FREQUENCY = ()
+    VALID_DATA = ()
+    DEFAULT_FREQUENCY = None
+    CATALOG = None
+
+    def __init__(
+        self,
+        api_key: ApiKey = None,
+        frequency: str = None,
+        data: list = None,
+        start: str = None,
+        end: str = None,
+        sort: list = None,
+        offset: int = 0,
+        length: int = 5000,
+        **facets,
+    ):
+        frequency = self.DEFAULT_FREQUENCY if frequency is None else frequency
+        if frequency not in self.VALID_FREQUENCY:
+            raise ValidationError(f"Invalid frequency argument:{frequency}")
+        data = utils.list_if_none(utils.list_if_str(data)) or list(self.VALID_DATA)
+        if any(d not in self.VALID_DATA for d in data):
+            raise ValidationError(f"Invalid data argument:{data}")
+        if any(facet not in self.FACETS for facet in facets):
+            raise ValidationError(f"Invalid facets:{list(facets)}")
+        super().__init__(
+            api_key,
+            frequency=frequency,
+            data=data,
+            facets={
+                facet: utils.list_if_str(values)
+                for facet, values in facets.items()
+                if values is not None
+            },
+            start=start,
+            end=end,
+            sort=sort,
+            offset=offset,
+            length=length,
+        )
+
+    def build(self, catalog=None, **kwargs) -> Endpoint:
+        """Build the endpoint, validating facet values against the catalog."""
+        catalog = self.CATALOG if catalog is None else catalog
+        return super().build(catalog=catalog, **kwargs)
+
+
+def endpoint_class(route: str, catalog=None) -> type:
+    """
+    Get (or create) the builder class of a route.
+
+    :param route: The route path (e.g. "electricity/rto/region-data").
+    :param catalog: The :class:`eia_client.metadata.Catalog` describing the
+     route (optional, a default catalog is created on first use).
+
+    :return: A :class:`GenericEndpoint` subclass for the route.
+    :rtype: type
+    """
+    # Imported here: eia_client.metadata imports the client, which imports
+    # this package.
+    from eia_client import metadata  # pylint: disable=import-outside-toplevel
+
+    global _CATALOG  # pylint: disable=global-statement
+    if catalog is None:
+        if _CATALOG is None:
+            _CATALOG = metadata.Catalog()
+        catalog = _CATALOG
+    path = metadata.route_path(route)
+    key = (catalog.base, path)
+    if key not in _CLASSES:
+        meta = catalog.route(path)
+        schema = {"period": "period"}
+        schema.update({facet: "category" for facet in meta.facets})
+        schema.update({column: "float" for column in meta.data})
+        schema.update({f"{column}-units": "category" for column in meta.data})
+        frequency = meta.default_frequency or next(iter(meta.frequencies), None)
+        _CLASSES[key] = type(
+            class_name(path),
+            (GenericEndpoint,),
+            {
+                "__doc__": f"{meta.name or path} endpoint (generated).",
+                "BASE": catalog.base,
+                "ENDPOINT": f"/{path}/data",
+                "ROUTE": path,
+                "FACETS": tuple(meta.facets),
+                "SCHEMA": schema,
+                "VALID_FREQUENCY": tuple(meta.frequencies),
+                "VALID_DATA": tuple(meta.data),
+                "DEFAULT_FREQUENCY": frequency,
+                "CATALOG": catalog,
+            },
+        )
+    return _CLASSES[key]
@@ -30,6 +30,14 @@ class TotalEnergy(EndpointBuilder):
     )
     DEFAULT_MSN = "ELETPUS"
     DATA = ["value"]
+    FACETS = ("msn",)
+    SCHEMA = {
+        "period": "period",
+        "msn": "category",
+        "seriesDescription": "category",
+        "value": "float",
+        "unit": "category",
+    }
     ENDPOINT = "/total-energy/data"
 
     def __init__(
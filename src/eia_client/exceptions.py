@@ -0,0 +1,50 @@
+"""EIA client exceptions module."""
+
+
+class EIAError(RuntimeError):
+    """Base class of EIA client errors."""
+
+
+class ResponseError(EIAError):
+    """
+    The API responded with an error status.
+
+    :param status_code: The HTTP status code.
+    :param reason: The HTTP reason phrase.
+    :param url: The requested url (without API key).
+    """
+
+    def __init__(self, status_code: int, reason: str = "", url: str = ""):
+        super().__init__(f"status:{status_code} reason:{reason} url:{url}")
+        self.status_code = status_code
+        self.reason = reason
+        self.url = url
+
+
+class RateLimitError(ResponseError):
+    """The API responded with 429 (Too Many Requests)."""
+
+
+class RetryError(EIAError):
+    """
+    A request still failed after every retry attempt.
+
+    :param attempts: Number of attempts made.
+    :param message: Description of the last failure.
+    """
+
+    def __init__(self, attempts: int, message: str = ""):
+        super().__init__(f"Failed after {attempts} attempts:{message}")
+        self.attempts = attempts
+
+
+class ValidationError(EIAError):
+    """A query doesn't match the route metadata (unknown facet, value, ...)."""
+
+
+def for_status(status_code: int, reason: str = "", url: str = "") -> ResponseError:
+    """The typed error for an HTTP error status."""
+    url = url.split("api_key=")[0].rstrip("?/&")
+    if status_code == 429:
+        return RateLimitError(status_code, reason, url)
+    return ResponseError(status_code, reason, url)
@@ -0,0 +1,173 @@
+"""
+EIA client instrumentation module.
+
+A :class:`eia_client.client.Client` calls its hooks with an :class:`Event`
+for every step of its hot path:
+
+``request``
+    One per request (all attempts): ``url``, ``status``, ``attempts``,
+    ``throttled`` (seconds waiting on the rate limiter), ``latency`` (time to
+    the response headers, including connecting), ``download`` (time reading
+    the body, unless streamed) and ``bytes``.
+``cache``
+    One per cache lookup: ``url`` and ``result`` ("hit", "miss" or
+    "revalidated").
+``result_cache``
+    One per result cache lookup: ``url`` and ``result`` ("hit" or "miss").
+``parse``
+    One per parsed page: ``parser``, ``rows``, ``decode`` (JSON decoding)
+    and ``build`` (dataframe/table construction), unless streamed.
+
+A hook is any callable taking an event. :class:`Aggregator` keeps in-memory
+totals and :class:`OpenTelemetryExporter` records events as OpenTelemetry
+spans (requires the optional ``opentelemetry-api`` dependency).
+"""
+
+from dataclasses import dataclass, field
+from threading import Lock
+import importlib.util
+import logging
+
+from eia_client.utils import LazyModule
+
+
+trace = LazyModule("opentelemetry.trace")
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class Event:
+    """
+    An instrumented step.
+
+    :param name: The step ("request", "cache", "result_cache" or "parse").
+    :param start: Wall clock start time (seconds since the epoch).
+    :param duration: Seconds the step took.
+    :param attributes: Step details (see module documentation).
+    """
+
+    name: str
+    start: float
+    duration: float
+    attributes: dict = field(default_factory=dict)
+
+
+def emit(hooks: list, event: Event) -> None:
+    """Call every hook with an event (a failing hook is logged, not raised)."""
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Instrumentation hook failed:%s", hook)
+
+
+@dataclass
+class StepStats:
+    """
+    Totals of one step.
+
+    :param count: Number of events.
+    :param duration: Total seconds.
+    :param max_duration: Longest event in seconds.
+    :param totals: Sums of the numeric attributes (bytes, rows, ...).
+    :param counts: Counts of the string attributes' values (cache results,
+     ...), keyed by "attribute:value".
+    """
+
+    count: int = 0
+    duration: float = 0.0
+    max_duration: float = 0.0
+    totals: dict = field(default_factory=dict)
+    counts: dict = field(default_factory=dict)
+
+    @property
+    def mean_duration(self) -> float:
+        """Mean seconds per event."""
+        return self.duration / self.count if self.count else 0.0
+
+
+class Aggregator:
+    """
+    In-memory instrumentation hook keeping totals per step.
+
+    Thread safe, so one aggregator can be shared by concurrent clients.
+
+    :param counted: String attributes whose values are counted.
+    """
+
+    def __init__(self, counted: tuple = ("result", "status")):
+        self._counted = counted
+        self._lock = Lock()
+        self.steps = {}
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            stats = self.steps.setdefault(event.name, StepStats())
+            stats.count += 1
+            stats.duration += event.duration
+            stats.max_duration = max(stats.max_duration, event.duration)
+            for name, value in event.attributes.items():
+                if name in self._counted:
+                    key = f"{name}:{value}"
+                    stats.counts[key] = stats.counts.get(key, 0) + 1
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    stats.totals[name] = stats.totals.get(name, 0) + value
+
+    def summary(self) -> dict:
+        """
+        Totals per step as plain dicts (e.g. for logging).
+
+        :return: Step name to count, durations, totals and counts.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                name: {
+                    "count": stats.count,
+                    "duration": stats.duration,
+                    "mean_duration": stats.mean_duration,
+                    "max_duration": stats.max_duration,
+                    **stats.totals,
+                    **stats.counts,
+                }
+                for name, stats in self.steps.items()
+            }
+
+    def reset(self) -> None:
+        """Forget every event."""
+        with self._lock:
+            self.steps = {}
+
+
+class OpenTelemetryExporter:
+    """
+    Instrumentation hook recording events as OpenTelemetry spans.
+
+    Spans are named ``eia_client.<step>`` and carry the event attributes.
+
+    :param tracer: An OpenTelemetry tracer (optional, defaults to the
+     ``eia_client`` tracer of the global tracer provider).
+    """
+
+    def __init__(self, tracer=None):
+        if tracer is None:
+            if importlib.util.find_spec("opentelemetry") is None:
+                raise RuntimeError(
+                    "OpenTelemetryExporter requires opentelemetry-api: "
+                    "pip install opentelemetry-api"
+                )
+            tracer = trace.get_tracer("eia_client")
+        self._tracer = tracer
+
+    def __call__(self, event: Event) -> None:
+        start = int(event.start * 1e9)
+        attributes = {
+            name: value
+            for name, value in event.attributes.items()
+            if isinstance(value, (str, bool, int, float))
+        }
+        span = self._tracer.start_span(
+            f"eia_client.{event.name}", start_time=start, attributes=attributes
+        )
+        span.end(end_time=start + int(event.duration * 1e9))
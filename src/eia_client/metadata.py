@@ -0,0 +1,258 @@
+"""
+EIA client route metadata module.
+
+Every EIA v2 data route (``/v2/<route>/data``) is described by its metadata
+route (``/v2/<route>``: frequencies, facets, data columns, period range) and
+lists the values of each facet at ``/v2/<route>/facet/<facet id>``. The
+:class:`Catalog` fetches these once, caches them on disk with a TTL and keeps
+in-memory indexes, so queries can be validated before they are sent and the
+planner can look up facet values (and cardinalities) without network calls.
+"""
+
+from dataclasses import dataclass, field
+from difflib import get_close_matches
+from pathlib import Path
+from threading import Lock
+from urllib.parse import urlsplit
+import json
+import logging
+import time
+
+from requests import RequestException
+
+from eia_client.client import Client
+from eia_client.endpoint.builder import Endpoint, EndpointBuilder
+from eia_client.exceptions import EIAError, ValidationError, for_status
+
+
+DIR_BASE_NAME = ".eia.metadata"
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_default_metadata_dir() -> Path:
+    """
+    Get the default metadata cache directory.
+
+    :return: default Path to the metadata cache ("~/.eia.metadata").
+    :rtype: Path
+    """
+    return Path().home().joinpath(DIR_BASE_NAME)
+
+
+def route_path(route: str) -> str:
+    """
+    Normalize a route, url or data url to its route path.
+
+    :param route: E.g. "https://api.eia.gov/v2/electricity/retail-sales/data",
+     "/electricity/retail-sales/data" or "electricity/retail-sales".
+
+    :return: The route path (e.g. "electricity/retail-sales").
+    :rtype: str
+    """
+    path = urlsplit(route).path if "://" in route else route
+    parts = [part for part in path.split("/") if part]
+    if "v2" in parts:
+        parts = parts[parts.index("v2") + 1 :]
+    if parts and parts[-1] == "data":
+        parts = parts[:-1]
+    return "/".join(parts)
+
+
+@dataclass
+class RouteMetadata:
+    """
+    Metadata of a data route.
+
+    :param route: The route path (e.g. "total-energy").
+    :param name: The route name.
+    :param frequencies: Frequency id to period format.
+    :param facets: Facet id to description.
+    :param data: Data column to units.
+    :param start_period: First available period.
+    :param end_period: Last available period.
+    :param default_frequency: The frequency used when none is requested.
+    """
+
+    route: str
+    name: str = ""
+    frequencies: dict = field(default_factory=dict)
+    facets: dict = field(default_factory=dict)
+    data: dict = field(default_factory=dict)
+    start_period: str = None
+    end_period: str = None
+    default_frequency: str = None
+
+    @classmethod
+    def from_response(cls, route: str, response: dict) -> "RouteMetadata":
+        """Route metadata from a metadata route's "response" object."""
+        return cls(
+            route=route,
+            name=response.get("name", ""),
+            frequencies={
+                f["id"]: f.get("format") for f in response.get("frequency", [])
+            },
+            facets={f["id"]: f.get("description") for f in response.get("facets", [])},
+            data={
+                column: (info or {}).get("units")
+                for column, info in response.get("data", {}).items()
+            },
+            start_period=response.get("startPeriod"),
+            end_period=response.get("endPeriod"),
+            default_frequency=response.get("defaultFrequency"),
+        )
+
+
+def _invalid(kind: str, values, valid) -> str:
+    """Describe invalid values, suggesting close matches for typos."""
+    messages = []
+    for value in values:
+        matches = get_close_matches(str(value), [str(v) for v in valid], n=1)
+        hint = f" (did you mean {matches[0]}?)" if matches else ""
+        messages.append(f"{kind}:{value}{hint}")
+    return ", ".join(messages)
+
+
+class Catalog:
+    """
+    Cached catalog of route metadata and facet values.
+
+    Responses are stored as JSON files in ``directory`` and refetched once
+    they are older than ``ttl`` seconds (a stale file is used if refetching
+    fails). Lookups after the first are served from memory. Safe to share
+    between threads: fetches and cache file writes are serialized.
+
+    :param client: The client used to fetch metadata (optional, created on
+     first fetch if not provided).
+    :param directory: The cache directory (default "~/.eia.metadata").
+    :param ttl: Seconds before cached metadata is refetched.
+    :param base: The API base url.
+    """
+
+    def __init__(
+        self,
+        client: Client = None,
+        directory: Path = None,
+        ttl: float = 7 * 24 * 3600,
+        base: str = EndpointBuilder.BASE,
+    ):
+        self._client = client
+        self.base = base.rstrip("/")
+        if directory is None:
+            directory = get_default_metadata_dir()
+        self._directory = Path(directory)
+        self._ttl = ttl
+        self._routes = {}
+        self._facet_values = {}
+        self._lock = Lock()
+
+    def _file(self, path: str) -> Path:
+        return self._directory.joinpath(f"{path.replace('/', '.')}.json")
+
+    def _read(self, path: str, fresh: bool = True) -> dict:
+        """A cached response (None if missing or, if fresh, expired)."""
+        if not self._file(path).exists():
+            return None
+        cached = json.loads(self._file(path).read_text(encoding="utf-8"))
+        if fresh and time.time() - cached["fetched"] > self._ttl:
+            return None
+        return cached["response"]
+
+    def _fetch(self, path: str) -> dict:
+        """A metadata response, from the disk cache or the API."""
+        with self._lock:
+            return self._fetch_locked(path)
+
+    def _fetch_locked(self, path: str) -> dict:
+        response = self._read(path)
+        if response is not None:
+            return response
+        if self._client is None:
+            self._client = Client()
+        try:
+            resp = self._client.get_url(f"{self.base}/{path}")
+            if resp.status_code != 200:
+                raise for_status(resp.status_code, resp.reason, resp.url)
+            response = resp.json().get("response", {})
+        except (RequestException, EIAError):
+            response = self._read(path, fresh=False)
+            if response is None:
+                raise
+            LOGGER.warning("Using stale metadata:%s", path)
+            return response
+        self._directory.mkdir(parents=True, exist_ok=True)
+        cached = {"fetched": time.time(), "response": response}
+        # Replaced in one step so other processes never read a partial file.
+        partial = self._file(path).with_suffix(".json.partial")
+        partial.write_text(json.dumps(cached), encoding="utf-8")
+        partial.replace(self._file(path))
+        return response
+
+    def route(self, route: str) -> RouteMetadata:
+        """
+        Metadata of a route.
+
+        :param route: A route, url or endpoint url (see :func:`route_path`).
+
+        :return: The route metadata.
+        :rtype: RouteMetadata
+        """
+        path = route_path(route)
+        if path not in self._routes:
+            self._routes[path] = RouteMetadata.from_response(path, self._fetch(path))
+        return self._routes[path]
+
+    def facet_values(self, route: str, facet: str) -> dict:
+        """
+        Values of a route's facet.
+
+        :param route: A route, url or endpoint url (see :func:`route_path`).
+        :param facet: The facet id (e.g. "stateid").
+
+        :return: Facet value id to name (e.g. {"CA": "California"}).
+        :rtype: dict
+        """
+        key = (route_path(route), facet)
+        if key not in self._facet_values:
+            response = self._fetch(f"{key[0]}/facet/{facet}")
+            self._facet_values[key] = {
+                value["id"]: value.get("name") for value in response.get("facets", [])
+            }
+        return self._facet_values[key]
+
+    def cardinality(self, route: str, facet: str) -> int:
+        """Number of values of a route's facet (e.g. for query planning)."""
+        return len(self.facet_values(route, facet))
+
+    def validate(self, endpoint: Endpoint) -> Endpoint:
+        """
+        Check an endpoint's frequency, data columns and facets.
+
+        :param endpoint: The endpoint to check.
+
+        :return: The endpoint.
+        :rtype: Endpoint
+        :raises ValidationError: If anything doesn't match the route metadata.
+        """
+        metadata = self.route(endpoint.endpoint)
+        params = endpoint.params
+        errors = []
+        if metadata.frequencies and params.frequency not in metadata.frequencies:
+            errors.append(
+                _invalid("frequency", [params.frequency], metadata.frequencies)
+            )
+        columns = [c for c in params.data if c not in metadata.data]
+        if metadata.data and columns:
+            errors.append(_invalid("data", columns, metadata.data))
+        for facet, values in params.facets.items():
+            if facet not in metadata.facets:
+                errors.append(_invalid("facet", [facet], metadata.facets))
+                continue
+            valid = self.facet_values(metadata.route, facet)
+            invalid = [value for value in values if value not in valid]
+            if invalid:
+                errors.append(_invalid(facet, invalid, valid))
+        if errors:
+            message = "; ".join(errors)
+            raise ValidationError(f"Invalid query for {metadata.route}: {message}")
+        return endpoint
@@ -0,0 +1,263 @@
+"""
+EIA client panel module.
+
+Pivots long format data (one row per period and series, as returned by
+:meth:`eia_client.client.Client.get_all` or :func:`eia_client.parse.as_dataframe`)
+into a :class:`Panel`: a float64 NumPy matrix with one row per period and one
+column per series (e.g. per MSN, or per state and sector), NaN where a period
+has no value.
+
+Periods are indexed by their integer ordinals, so a panel is built with a
+single scatter into a pre-sized array rather than a pandas pivot, and
+converting to a lower frequency (e.g. monthly to annual) reduces contiguous
+row blocks with ``numpy.ufunc.reduceat``. :func:`align` puts panels of mixed
+frequencies on a common frequency and period range.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Sequence, Union
+
+from eia_client import period
+from eia_client.utils import LazyModule
+
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+# Pandas frequencies, highest first.
+_ORDER = ("h", "D", "W", "M", "Q", "Y")
+
+HOW = ("sum", "mean", "min", "max", "first", "last")
+
+
+def _freq(frequency: str) -> str:
+    """Pandas frequency of an EIA frequency or pandas alias ("Y-DEC" -> "Y")."""
+    freq = period.FREQUENCIES.get(frequency, frequency).split("-")[0]
+    if freq not in _ORDER:
+        raise RuntimeError(f"Unsupported frequency:{frequency}")
+    return freq
+
+
+def _reduce(values: np.ndarray, starts: np.ndarray, how: str, min_count: int):
+    """Reduce the row blocks of values starting at starts, ignoring NaN."""
+    missing = np.isnan(values)
+    counts = np.add.reduceat((~missing).astype("int64"), starts, axis=0)
+    if how in ("sum", "mean"):
+        reduced = np.add.reduceat(np.where(missing, 0.0, values), starts, axis=0)
+        if how == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                reduced = reduced / counts
+    elif how == "min":
+        reduced = np.fmin.reduceat(values, starts, axis=0)
+    elif how == "max":
+        reduced = np.fmax.reduceat(values, starts, axis=0)
+    elif how == "first":
+        reduced = values[starts]
+    elif how == "last":
+        reduced = values[np.append(starts[1:], len(values)) - 1]
+    else:
+        raise RuntimeError(f"Invalid aggregation:{how} (expected one of {HOW})")
+    reduced[counts < max(min_count, 1)] = np.nan
+    return reduced
+
+
+@dataclass(frozen=True)
+class Panel:
+    """
+    A period x series matrix.
+
+    :param values: float64 array shaped (periods, series), NaN for gaps.
+    :param periods: The consecutive periods of the rows.
+    :param series: The series keys of the columns (a MultiIndex when series
+     are identified by more than one column).
+    """
+
+    values: np.ndarray
+    periods: pd.PeriodIndex
+    series: pd.Index
+
+    @property
+    def freq(self) -> str:
+        """The pandas frequency of the periods ("M", "Y", ...)."""
+        return _freq(self.periods.freqstr)
+
+    def to_frame(self) -> pd.DataFrame:
+        """The panel as a wide dataframe (sharing the values array)."""
+        return pd.DataFrame(
+            self.values, index=self.periods, columns=self.series, copy=False
+        )
+
+    def resample(self, freq: str, how: str = "sum", min_count: int = 1) -> Panel:
+        """
+        Convert the panel to a lower frequency.
+
+        Rows are grouped by the lower frequency period they end in (e.g. the
+        months of each year) and each group is reduced ignoring NaN.
+
+        :param freq: The frequency, an EIA frequency ("annual") or a pandas
+         alias ("Y").
+        :param how: The aggregation ("sum", "mean", "min", "max", or "first"
+         / "last" for the value of the first / last sub-period).
+        :param min_count: Minimum number of values a group needs, otherwise
+         it is NaN (e.g. 12 to only keep complete years of monthly data).
+
+        :return: The resampled panel (this panel if freq is its frequency).
+        :rtype: Panel
+        """
+        freq = _freq(freq)
+        if freq == self.freq:
+            return self
+        if _ORDER.index(freq) < _ORDER.index(self.freq):
+            raise RuntimeError(f"Can't resample {self.freq} to the higher {freq}")
+        target = self.periods.asfreq(freq)
+        ordinals = target.asi8
+        starts = np.flatnonzero(np.append(True, ordinals[1:] != ordinals[:-1]))
+        if len(starts) == 0:
+            return Panel(self.values[:0].copy(), target, self.series)
+        values = _reduce(self.values, starts, how, min_count)
+        return Panel(values, target[starts], self.series)
+
+
+def _period_index(column: pd.Series, frequency: str) -> pd.PeriodIndex:
+    """Periods of a typed (Period) or untyped (EIA string) period column."""
+    if isinstance(column.dtype, pd.PeriodDtype):
+        return pd.PeriodIndex(column)
+    return period.to_index(column, frequency)
+
+
+def _series_codes(frames: list, columns: list) -> tuple:
+    """Column codes of every row (-1 for missing keys) and the series keys."""
+    codes = []
+    levels = []
+    for name in columns:
+        keys = np.concatenate([np.asarray(f[name], dtype=object) for f in frames])
+        code, uniques = pd.factorize(keys, sort=True)
+        codes.append(code)
+        levels.append(uniques)
+    if len(columns) == 1:
+        return codes[0], pd.Index(levels[0], name=columns[0])
+    valid = np.logical_and.reduce([code >= 0 for code in codes])
+    shape = [len(level) for level in levels]
+    combined = np.ravel_multi_index([np.where(valid, c, 0) for c in codes], shape)
+    keys, code = np.unique(combined[valid], return_inverse=True)
+    series = pd.MultiIndex(
+        levels=levels, codes=np.unravel_index(keys, shape), names=columns
+    )
+    expanded = np.full(len(valid), -1, dtype="int64")
+    expanded[valid] = code
+    return expanded, series
+
+
+def build(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    series: Union[str, Sequence[str]] = "msn",
+    value: str = "value",
+    frequency: str = "monthly",
+    period_column: str = "period",
+) -> Panel:
+    """
+    Build a panel from long format data.
+
+    :param data: A dataframe, or the dataframes of fetched pages (they are
+     not concatenated).
+    :param series: The column(s) identifying a series (e.g. "msn", or
+     ["stateid", "sectorid"]).
+    :param value: The value column (converted to float, invalid values are
+     NaN).
+    :param frequency: The EIA frequency of untyped (string) period columns
+     (typed Period columns carry their frequency).
+    :param period_column: The period column.
+
+    :return: The panel, with every period between the first and last one a
+     row and the series sorted by key. Rows with a missing period or key are
+     skipped; if a period and series repeat, the last value wins.
+    :rtype: Panel
+    """
+    frames = [data] if isinstance(data, pd.DataFrame) else list(data)
+    if not frames:
+        raise RuntimeError("No data to build a panel from")
+    columns = [series] if isinstance(series, str) else list(series)
+    indexes = [_period_index(frame[period_column], frequency) for frame in frames]
+    freqs = {index.freqstr for index in indexes}
+    if len(freqs) > 1:
+        raise RuntimeError(f"Mixed frequencies:{sorted(freqs)}, align panels instead")
+    ordinals = np.concatenate([index.asi8 for index in indexes])
+    values = np.concatenate(
+        [
+            pd.to_numeric(frame[value], errors="coerce").to_numpy(
+                dtype="float64", na_value=np.nan
+            )
+            for frame in frames
+        ]
+    )
+    codes, series_index = _series_codes(frames, columns)
+    valid = (codes >= 0) & ~np.concatenate([index.isna() for index in indexes])
+    freq = freqs.pop()
+    if not valid.any():
+        periods = pd.PeriodIndex([], freq=freq)
+        return Panel(np.empty((0, len(series_index))), periods, series_index)
+    ordinals, codes, values = ordinals[valid], codes[valid], values[valid]
+    start = ordinals.min()
+    periods = pd.period_range(
+        start=pd.Period(ordinal=start, freq=freq), periods=ordinals.max() - start + 1
+    )
+    matrix = np.full((len(periods), len(series_index)), np.nan)
+    matrix[ordinals - start, codes] = values
+    return Panel(matrix, periods, series_index)
+
+
+def align(
+    panels: Iterable[Panel],
+    freq: str = None,
+    how: Union[str, Sequence[str]] = "sum",
+    min_count: int = 1,
+) -> Panel:
+    """
+    Align panels of mixed frequencies into one panel.
+
+    Each panel is resampled to the common frequency (see
+    :meth:`Panel.resample`) and placed side by side over the union of their
+    period ranges, NaN outside each panel's range.
+
+    :param panels: The panels.
+    :param freq: The common frequency (optional, defaults to the lowest
+     frequency of the panels).
+    :param how: The aggregation, or one aggregation per panel (e.g. "sum"
+     for sales and "mean" for prices).
+    :param min_count: Minimum number of values per resampled period.
+
+    :return: The aligned panel, with the series of every panel in order.
+    :rtype: Panel
+    """
+    panels = list(panels)
+    if not panels:
+        raise RuntimeError("No panels to align")
+    if freq is None:
+        freq = max((panel.freq for panel in panels), key=_ORDER.index)
+    hows = [how] * len(panels) if isinstance(how, str) else list(how)
+    panels = [
+        panel.resample(freq, how_, min_count) for panel, how_ in zip(panels, hows)
+    ]
+    filled = [panel for panel in panels if len(panel.periods)]
+    series = panels[0].series.append([panel.series for panel in panels[1:]])
+    if not filled:
+        periods = pd.PeriodIndex([], freq=panels[0].periods.freq)
+        return Panel(np.empty((0, len(series))), periods, series)
+    start = min(panel.periods.asi8[0] for panel in filled)
+    end = max(panel.periods.asi8[-1] for panel in filled)
+    periods = pd.period_range(
+        start=pd.Period(ordinal=start, freq=filled[0].periods.freq),
+        periods=end - start + 1,
+    )
+    matrix = np.full((len(periods), len(series)), np.nan)
+    column = 0
+    for panel in panels:
+        width = panel.values.shape[1]
+        if len(panel.periods):
+            offset = panel.periods.asi8[0] - start
+            rows = slice(offset, offset + len(panel.periods))
+            matrix[rows, column : column + width] = panel.values
+        column += width
+    return Panel(matrix, periods, series)
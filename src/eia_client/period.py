@@ -0,0 +1,108 @@
+"""
+EIA client period (date) helper module.
+
+The API formats periods per frequency ("2020" annual, "2020-Q1" quarterly,
+"2020-01" monthly, "2020-01-31" daily, "2020-01-31T05" hourly). These helpers
+convert between those strings and pandas periods.
+
+Local hourly periods carry a UTC offset ("2024-01-01T00-05"), which pandas
+periods can't represent, so they are left as strings (see :func:`is_typed`);
+:func:`shift` shifts them as local hours keeping the offset.
+"""
+
+from __future__ import annotations
+
+from eia_client.utils import LazyModule
+
+
+pd = LazyModule("pandas")
+
+
+FREQUENCIES = {
+    "annual": "Y",
+    "quarterly": "Q",
+    "monthly": "M",
+    "weekly": "W",
+    "daily": "D",
+    "hourly": "h",
+}
+
+LOCAL_HOURLY = "local-hourly"
+
+_FORMATS = {
+    "Y": "%Y",
+    "M": "%Y-%m",
+    "W": "%Y-%m-%d",
+    "D": "%Y-%m-%d",
+    "h": "%Y-%m-%dT%H",
+}
+
+
+def pandas_freq(frequency: str) -> str:
+    """
+    Get the pandas frequency alias of an EIA frequency.
+
+    :param frequency: EIA frequency ("monthly", "annual", ...).
+
+    :return: The pandas frequency alias ("M", "Y", ...).
+    :rtype: str
+    """
+    if frequency not in FREQUENCIES:
+        raise RuntimeError(f"Unsupported frequency:{frequency}")
+    return FREQUENCIES[frequency]
+
+
+def is_typed(frequency: str) -> bool:
+    """Whether periods of an EIA frequency convert to pandas periods."""
+    return frequency != LOCAL_HOURLY
+
+
+def to_period(value: str, frequency: str) -> pd.Period:
+    """Parse an EIA period string."""
+    return pd.Period(value, freq=pandas_freq(frequency))
+
+
+def to_index(values, frequency: str) -> pd.PeriodIndex:
+    """Parse EIA period strings as a pandas PeriodIndex (vectorized)."""
+    freq = pandas_freq(frequency)
+    if freq in ("Q", "W"):
+        return pd.PeriodIndex(list(values), freq=freq)
+    datetimes = pd.to_datetime(values, format=_FORMATS[freq])
+    return pd.DatetimeIndex(datetimes).to_period(freq)
+
+
+def to_str(period: pd.Period, frequency: str) -> str:
+    """Format a pandas period the way the API expects it."""
+    freq = pandas_freq(frequency)
+    if freq == "Q":
+        return f"{period.year}-Q{period.quarter}"
+    if freq == "W":
+        period = period.start_time
+    return period.strftime(_FORMATS[freq])
+
+
+def format_index(index: pd.PeriodIndex) -> pd.Index:
+    """Format a pandas PeriodIndex as EIA period strings (vectorized)."""
+    freq = index.freqstr.split("-")[0]
+    if freq == "Q":
+        return index.year.astype(str) + "-Q" + index.quarter.astype(str)
+    if freq == "W":
+        return index.start_time.strftime(_FORMATS[freq])
+    return index.strftime(_FORMATS[freq])
+
+
+def shift(value: str, frequency: str, periods: int) -> str:
+    """
+    Shift an EIA period string by a number of periods.
+
+    :param value: EIA period string (e.g. "2020-01").
+    :param frequency: EIA frequency of the period.
+    :param periods: Number of periods to shift by (negative to go back).
+
+    :return: The shifted EIA period string.
+    :rtype: str
+    """
+    if frequency == LOCAL_HOURLY:
+        local, offset = value[:13], value[13:]  # "2024-01-01T00", "-05"
+        return shift(local, "hourly", periods) + offset
+    return to_str(to_period(value, frequency) + periods, frequency)
@@ -0,0 +1,192 @@
+"""
+EIA client query planner module.
+
+A large query (many facet values times decades of periods) is one long result
+that can only be walked page by page. The planner splits it into independent
+shards, one per facet value combination and period window, which can be
+fetched in parallel, cached and retried separately and then stitched back
+together (see :meth:`eia_client.client.Client.get_shards`).
+
+The opposite also applies to many small queries: identical queries are
+deduplicated and queries differing only in the values of one facet (e.g. one
+``TotalEnergy`` per MSN) are merged into one query, see :func:`merge`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field, replace
+from itertools import product
+from typing import List, Tuple
+import json
+
+from eia_client import parse
+from eia_client import period
+from eia_client.cache import request_key, route
+from eia_client.endpoint.builder import Endpoint
+from eia_client.utils import LazyModule
+
+
+pd = LazyModule("pandas")
+
+
+def period_windows(
+    start: str, end: str, frequency: str, size: int
+) -> List[Tuple[str, str]]:
+    """
+    Split an inclusive period range into windows.
+
+    :param start: First period (EIA period string).
+    :param end: Last period (None for the current period).
+    :param frequency: EIA frequency of the periods.
+    :param size: Number of periods per window.
+
+    :return: Inclusive (start, end) EIA period strings of each window.
+    :rtype: List[Tuple[str, str]]
+    """
+    first = period.to_period(start, frequency)
+    if end is None:
+        last = pd.Period.now(period.pandas_freq(frequency))
+    else:
+        last = period.to_period(end, frequency)
+    windows = []
+    while first <= last:
+        stop = min(first + (size - 1), last)
+        window = (period.to_str(first, frequency), period.to_str(stop, frequency))
+        windows.append(window)
+        first = stop + 1
+    return windows
+
+
+def plan(endpoint: Endpoint, facets=(), periods: int = None) -> List[Endpoint]:
+    """
+    Split an endpoint into independent shards.
+
+    :param endpoint: The endpoint to split.
+    :param facets: Facets to split on, one shard per value. Either facet names
+     (split over the values the endpoint lists) or a dict of facet name to
+     values (e.g. every state id, for a facet the endpoint doesn't filter).
+    :param periods: Number of periods per shard (optional). Requires the
+     endpoint to have a start.
+
+    :return: The shards (the endpoint itself if nothing is split).
+    :rtype: List[Endpoint]
+    """
+    params = endpoint.params
+    if not isinstance(facets, dict):
+        facets = {name: params.facets.get(name, []) for name in facets}
+    names = [name for name, values in facets.items() if values]
+    windows = [(params.start, params.end)]
+    if periods is not None and params.start is not None:
+        windows = period_windows(params.start, params.end, params.frequency, periods)
+    shards = []
+    for values in product(*(facets[name] for name in names)):
+        shard_facets = dict(params.facets, **{n: [v] for n, v in zip(names, values)})
+        for start, end in windows:
+            shard_params = replace(params, facets=shard_facets, start=start, end=end)
+            shards.append(Endpoint(endpoint.endpoint, shard_params))
+    return shards
+
+
+def stitch(frames: list, sort: list = None, schema: dict = None) -> pd.DataFrame:
+    """
+    Stitch shard results back into one result.
+
+    :param frames: One dataframe per shard.
+    :param sort: The original endpoint's sort ([{"column", "direction"}]).
+    :param schema: The schema the frames were parsed with (optional).
+
+    :return: The concatenated dataframe in the original sort order.
+    :rtype: pd.DataFrame
+    """
+    frames = [data_df for data_df in frames if not data_df.empty]
+    if not frames:
+        return pd.DataFrame()
+    data_df = parse.concat(frames, schema=schema)
+    sort = [s for s in (sort or []) if s["column"] in data_df]
+    if sort:
+        data_df = data_df.sort_values(
+            [s["column"] for s in sort],
+            ascending=[s.get("direction") != "desc" for s in sort],
+            kind="stable",
+            ignore_index=True,
+        )
+    return data_df
+
+
+@dataclass
+class MergedQuery:
+    """
+    A query answering one or more of the queries given to :func:`merge`.
+
+    :param endpoint: The endpoint to request.
+    :param members: Indices of the queries it answers.
+    :param facet: The facet the members were merged on (None if the members
+     are identical queries).
+    """
+
+    endpoint: Endpoint
+    members: list = field(default_factory=list)
+    facet: str = None
+
+
+def _signature(endpoint: Endpoint, facet: str) -> str:
+    """Identifies endpoints that are equal except for one facet's values."""
+    params = asdict(endpoint.params)
+    params["facets"] = {k: v for k, v in params["facets"].items() if k != facet}
+    return json.dumps([route(endpoint), facet, params], sort_keys=True)
+
+
+def merge(endpoints: List[Endpoint], max_merged: int = 100) -> List[MergedQuery]:
+    """
+    Deduplicate and merge compatible queries.
+
+    :param endpoints: The queries.
+    :param max_merged: Maximum number of queries merged into one query.
+
+    :return: The queries to request, each listing the queries it answers.
+    :rtype: List[MergedQuery]
+    """
+    unique = {}
+    for i, endpoint in enumerate(endpoints):
+        unique.setdefault(request_key(endpoint), []).append(i)
+    merged = []
+    pending = list(unique.values())
+    facet_names = dict.fromkeys(
+        name for endpoint in endpoints for name in endpoint.params.facets
+    )
+    for facet in facet_names:
+        groups = {}
+        for members in pending:
+            endpoint = endpoints[members[0]]
+            if endpoint.params.facets.get(facet):
+                key = _signature(endpoint, facet)
+            else:  # Missing or empty (unfiltered), so never merged on it.
+                key = request_key(endpoint)
+            groups.setdefault(key, []).append(members)
+        pending = []
+        for group in groups.values():
+            if len(group) == 1:
+                pending.append(group[0])
+                continue
+            for i in range(0, len(group), max_merged):
+                chunk = group[i : i + max_merged]
+                if len(chunk) == 1:
+                    merged.append(MergedQuery(endpoints[chunk[0][0]], chunk[0]))
+                    continue
+                values = dict.fromkeys(
+                    value
+                    for members in chunk
+                    for value in endpoints[members[0]].params.facets[facet]
+                )
+                first = endpoints[chunk[0][0]]
+                facets = dict(first.params.facets, **{facet: list(values)})
+                merged.append(
+                    MergedQuery(
+                        Endpoint(first.endpoint, replace(first.params, facets=facets)),
+                        [member for members in chunk for member in members],
+                        facet,
+                    )
+                )
+    for members in pending:
+        merged.append(MergedQuery(endpoints[members[0]], members))
+    return merged
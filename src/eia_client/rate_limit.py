@@ -0,0 +1,110 @@
+"""
+EIA client rate limit module.
+
+A token bucket smooths the request rate to just under the API's limit instead
+of bursting into 429 responses and backoff. One bucket can be shared by every
+thread (and asyncio task) using the same API key, see :func:`shared`.
+"""
+
+from dataclasses import dataclass
+from threading import Lock
+import asyncio
+import time
+
+from eia_client import api_key as ak
+
+
+_SHARED = {}
+
+_SHARED_LOCK = Lock()
+
+
+@dataclass
+class LimiterStats:
+    """Rate limiter counters."""
+
+    acquired: int = 0
+    throttled: int = 0
+    throttled_seconds: float = 0.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Each request takes a token. Tokens refill at ``rate`` per second up to
+    ``burst``; when none is left the caller waits for its turn (callers are
+    served in the order they arrive).
+
+    :param rate: Sustained requests per second.
+    :param burst: Maximum number of requests sent back to back.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise RuntimeError("Rate limit needs rate > 0 and burst >= 1")
+        self.rate = rate
+        self.burst = burst
+        self.stats = LimiterStats()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return the seconds to wait until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = max(-self._tokens / self.rate, 0.0)
+            self.stats.acquired += 1
+            if wait:
+                self.stats.throttled += 1
+                self.stats.throttled_seconds += wait
+        return wait
+
+    def acquire(self) -> float:
+        """
+        Wait for a token (blocking).
+
+        :return: Seconds spent waiting.
+        :rtype: float
+        """
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Wait for a token without blocking the event loop.
+
+        :return: Seconds spent waiting.
+        :rtype: float
+        """
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+
+def shared(api_key: ak.ApiKey, rate: float, burst: int = 1) -> TokenBucket:
+    """
+    Get the token bucket shared by every client using an API key.
+
+    The bucket is created on first use; later calls return the same bucket
+    (and ignore rate and burst).
+
+    :param api_key: ApiKey data class.
+    :param rate: Sustained requests per second.
+    :param burst: Maximum number of requests sent back to back.
+
+    :return: The shared token bucket.
+    :rtype: TokenBucket
+    """
+    with _SHARED_LOCK:
+        if api_key.key not in _SHARED:
+            _SHARED[api_key.key] = TokenBucket(rate, burst)
+        return _SHARED[api_key.key]
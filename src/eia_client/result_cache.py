@@ -0,0 +1,145 @@
+"""
+EIA client in-memory result cache module.
+
+Parsed results (pandas dataframes and Arrow tables) are kept in process,
+keyed by the canonical query (see :func:`eia_client.cache.request_key`) and
+parse schema, so a repeated query skips the network and parsing entirely.
+The cache is bounded by the in-memory size of the results rather than their
+number: least recently used results are evicted once the total grows past
+``max_bytes``. Results expire after a TTL.
+
+Dataframes are copied when stored and when returned so callers can't
+mutate the cached result; Arrow tables are immutable and shared as is.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Hashable
+import logging
+import time
+
+from eia_client import utils
+
+
+pd = utils.LazyModule("pandas")
+
+LOGGER = logging.getLogger(__name__)
+
+
+def nbytes(value: Any) -> int:
+    """
+    In-memory size of a result.
+
+    :param value: A pandas dataframe or an Arrow table.
+
+    :return: Bytes used, including the contents of object (string) columns.
+    :rtype: int
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return int(value.nbytes)
+
+
+def _protect(value: Any) -> Any:
+    """A copy of a dataframe (Arrow tables are immutable)."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return value
+
+
+@dataclass
+class ResultCacheStats:
+    """Result cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class ResultCache:
+    """
+    In-memory LRU cache of parsed results, bounded by bytes.
+
+    Safe to share between threads (and clients).
+
+    :param max_bytes: Maximum total in-memory size of the cached results.
+     Results larger than this are not cached.
+    :param ttl: Time to live of a result in seconds.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl: float = 3600):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = ResultCacheStats()
+        self._lock = Lock()
+        self._entries = OrderedDict()  # key: (value, size, created)
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """Total in-memory size of the cached results."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Get a fresh cached result.
+
+        :param key: The result key.
+
+        :return: The result (a copy for dataframes) or None if missing or
+         expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[2] > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+        return _protect(entry[0])
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a result, evicting least recently used results to fit it.
+
+        :param key: The result key.
+        :param value: A pandas dataframe or an Arrow table (dataframes are
+         copied, so the caller may keep mutating theirs).
+        """
+        size = nbytes(value)
+        if size > self.max_bytes:
+            LOGGER.info("Result of %s bytes is too large to cache", size)
+            return None
+        value = _protect(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic())
+            self._size += size
+            evicted = 0
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+            self.stats.evictions += evicted
+        if evicted:
+            LOGGER.info("Evicted %s cached results", evicted)
+        return None
+
+    def _remove(self, key: Hashable) -> None:
+        self._size -= self._entries.pop(key)[1]
+
+    def clear(self) -> None:
+        """Drop every result."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
@@ -0,0 +1,111 @@
+"""
+EIA client retry module.
+
+Requests that fail with a transient status (429, 5xx) or a connection error
+are retried with capped exponential backoff and jitter, honoring the
+``Retry-After`` header when the server sends one (in full: the backoff cap
+doesn't shorten it, a wait longer than ``max_retry_after`` fails instead).
+The client only issues (idempotent) GET requests, so every request is safe
+to retry.
+"""
+
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import logging
+import random
+
+from requests import Response
+
+from eia_client.exceptions import RetryError
+
+
+LOGGER = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def retry_after(resp: Response) -> float:
+    """
+    Seconds to wait according to a response's Retry-After header.
+
+    :param resp: The response.
+
+    :return: Seconds to wait, or None without a (valid) header.
+    :rtype: float
+    """
+    value = resp.headers.get("Retry-After") if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry policy dataclass.
+
+    :param max_attempts: Maximum number of attempts per request (1 disables
+     retries).
+    :param backoff_base: Delay in seconds before the first retry; doubled on
+     every following retry.
+    :param backoff_cap: Maximum delay in seconds.
+    :param jitter: Randomize delays ("full jitter") so parallel workers
+     don't retry in lockstep.
+    :param respect_retry_after: Wait as long as the Retry-After header says.
+    :param max_retry_after: Longest Retry-After in seconds to wait for; a
+     longer one fails the request with a RetryError.
+    :param retry_statuses: HTTP statuses that are retried.
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_cap: float = 30.0
+    jitter: bool = True
+    respect_retry_after: bool = True
+    max_retry_after: float = 300.0
+    retry_statuses: tuple = RETRY_STATUSES
+
+    def should_retry(self, attempt: int, resp: Response = None) -> bool:
+        """
+        Whether to retry after an attempt.
+
+        :param attempt: The attempt that just failed (1 based).
+        :param resp: Its response (None after a connection error).
+        :rtype: bool
+        """
+        if attempt >= self.max_attempts:
+            return False
+        return resp is None or resp.status_code in self.retry_statuses
+
+    def delay(self, attempt: int, resp: Response = None) -> float:
+        """
+        Seconds to wait before the next attempt.
+
+        :param attempt: The attempt that just failed (1 based).
+        :param resp: Its response (None after a connection error).
+        :rtype: float
+
+        :raises RetryError: If the Retry-After header asks to wait longer
+         than max_retry_after.
+        """
+        if self.respect_retry_after:
+            seconds = retry_after(resp)
+            if seconds is not None and seconds > self.max_retry_after:
+                raise RetryError(
+                    attempt,
+                    f"Retry-After {seconds:.0f}s exceeds max_retry_after "
+                    f"{self.max_retry_after:.0f}s",
+                )
+            if seconds is not None:
+                return seconds
+        seconds = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, seconds) if self.jitter else seconds
@@ -0,0 +1,54 @@
+"""
+EIA client single-flight module.
+
+Concurrent calls with the same key share a single execution: the first caller
+runs the function and every caller arriving while it runs waits for, and
+receives, the same result (or exception).
+"""
+
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Callable, Hashable, Tuple
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls by key."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run func once for all concurrent callers with the same key.
+
+        :param key: Identifies identical calls.
+        :param func: The call to run (without arguments).
+
+        :return: The result and whether it was shared with other callers (in
+         which case it must not be mutated).
+        :rtype: Tuple[Any, bool]
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = [Future(), 0]
+            else:
+                call[1] += 1
+                self.coalesced += 1
+        if not leader:
+            return call[0].result(), True
+        try:
+            result = func()
+        except BaseException as exc:
+            with self._lock:
+                del self._calls[key]
+            call[0].set_exception(exc)
+            raise
+        with self._lock:
+            del self._calls[key]
+            shared = call[1] > 0
+        call[0].set_result(result)
+        return result, shared
@@ -0,0 +1,245 @@
+"""
+EIA client partitioned dataset store module.
+
+Fetched results are written into a hive partitioned parquet dataset, one
+dataset per route, partitioned by facet values (e.g. ``msn``, ``stateid``) and
+year::
+
+    root/total-energy/msn=ELETPUS/year=2020/part-0.parquet
+
+Reads are filtered with ``pyarrow.dataset`` so only the partitions (files)
+matching the facet values and period range are opened, and row groups are
+skipped using the parquet statistics of the "period" column.
+
+A write reads back the partitions it touches and rewrites them, so writes to
+a route's dataset are serialized between threads (e.g. concurrent batch
+jobs), whichever store instance they go through.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Lock
+import logging
+
+from eia_client import period
+from eia_client.utils import LazyModule
+
+
+pd = LazyModule("pandas")
+pa = LazyModule("pyarrow")
+ds = LazyModule("pyarrow.dataset")
+# Only for route_path: eia_client.metadata imports the client (and requests).
+ec_metadata = LazyModule("eia_client.metadata")
+
+PERIOD_COLUMN = "period"
+YEAR_COLUMN = "year"
+
+LOGGER = logging.getLogger(__name__)
+
+_WRITE_LOCKS = {}
+_WRITE_LOCKS_LOCK = Lock()
+
+
+def route_dir(route: str) -> str:
+    """
+    Dataset directory name of a route.
+
+    :param route: An API route (e.g. "/v2/electricity/retail-sales/data") or
+     any dataset name.
+
+    :return: The directory name (e.g. "electricity.retail-sales").
+    :rtype: str
+    """
+    return ec_metadata.route_path(route).replace("/", ".")
+
+
+def _period_strings(periods: pd.Series) -> pd.Series:
+    """EIA period strings of a period column (typed or not)."""
+    if isinstance(periods.dtype, pd.PeriodDtype):
+        values = period.format_index(pd.PeriodIndex(periods))
+        return pd.Series(values, index=periods.index)
+    return periods.astype(str)
+
+
+def _facet_filter(facets: dict):
+    expression = None
+    for name, values in (facets or {}).items():
+        term = ds.field(name).isin([str(v) for v in values])
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def _period_filter(start: str = None, end: str = None):
+    expression = None
+    if start is not None:
+        expression = (ds.field(YEAR_COLUMN) >= int(start[:4])) & (
+            ds.field(PERIOD_COLUMN) >= start
+        )
+    if end is not None:
+        # "2020-12" < "2020-12-31": compare against the end of the prefix.
+        term = (ds.field(YEAR_COLUMN) <= int(end[:4])) & (
+            ds.field(PERIOD_COLUMN) <= end + "\uffff"
+        )
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def _partitioning(partitions: list) -> ds.Partitioning:
+    """Hive partitioning with string facets and an integer year."""
+    schema = pa.schema(
+        [
+            (name, pa.int32() if name == YEAR_COLUMN else pa.string())
+            for name in partitions
+        ]
+    )
+    return ds.partitioning(schema, flavor="hive")
+
+
+def _write_lock(path: Path) -> Lock:
+    """The lock serializing writes to a dataset directory."""
+    with _WRITE_LOCKS_LOCK:
+        return _WRITE_LOCKS.setdefault(path.resolve(), Lock())
+
+
+def _and(*expressions):
+    expression = None
+    for term in expressions:
+        if term is not None:
+            expression = term if expression is None else expression & term
+    return expression
+
+
+class DatasetStore:
+    """
+    Partitioned parquet dataset store.
+
+    Writes replace the stored rows sharing a key (period and facets) with the
+    new rows, touching only the partitions the new rows fall into.
+
+    :param root: The root directory of the store.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path(self, route: str) -> Path:
+        """Directory of a route's dataset."""
+        return self.root.joinpath(route_dir(route))
+
+    def partitions(self, route: str) -> list:
+        """Partition columns of a route's dataset (facets then year)."""
+        path = self.path(route)
+        files = sorted(path.rglob("*.parquet")) if path.exists() else []
+        if not files:
+            return []
+        return [part.split("=", 1)[0] for part in files[0].relative_to(path).parts[:-1]]
+
+    def _dataset(self, route: str, partitions: list) -> ds.Dataset:
+        return ds.dataset(
+            self.path(route), format="parquet", partitioning=_partitioning(partitions)
+        )
+
+    def write(self, data_df: pd.DataFrame, route: str, facets=(), key=None) -> None:
+        """
+        Write data into a route's dataset.
+
+        :param data_df: The data to store (typed or not, see
+         :mod:`eia_client.parse`). Must have a "period" column.
+        :param route: The API route (or dataset name) the data came from.
+        :param facets: Facet columns to partition by (e.g. ("msn",)). Must be
+         the same on every write to a route.
+        :param key: The columns identifying a row (default: period and
+         facets). Stored rows with the key of a new row are replaced.
+        """
+        if data_df.empty:
+            LOGGER.warning("Dataframe is empty. No data to write.")
+            return None
+        with _write_lock(self.path(route)):
+            table = self._write(data_df, route, list(facets), key)
+        LOGGER.info("Wrote %s rows:%s", table.num_rows, self.path(route))
+
+    def _write(self, data_df: pd.DataFrame, route: str, facets: list, key) -> pa.Table:
+        """Merge data into the touched partitions and rewrite them."""
+        partitions = [*facets, YEAR_COLUMN]
+        stored_partitions = self.partitions(route)
+        if stored_partitions and stored_partitions != partitions:
+            raise ValueError(
+                f"Dataset {route_dir(route)} is partitioned by {stored_partitions}"
+            )
+        key = list(key or [PERIOD_COLUMN, *facets])
+        new_df = data_df.copy()
+        new_df[PERIOD_COLUMN] = _period_strings(new_df[PERIOD_COLUMN])
+        for facet in facets:
+            new_df[facet] = new_df[facet].astype(str)
+        new_df[YEAR_COLUMN] = new_df[PERIOD_COLUMN].str[:4].astype("int32")
+        if stored_partitions:
+            touched = new_df[partitions].drop_duplicates()
+            expression = _facet_filter({f: touched[f].unique() for f in facets})
+            years = ds.field(YEAR_COLUMN).isin(touched[YEAR_COLUMN].unique().tolist())
+            stored = self._dataset(route, partitions).to_table(
+                filter=_and(expression, years)
+            )
+            stored_df = stored.to_pandas().merge(touched, on=partitions)
+            new_df = pd.concat([stored_df, new_df], ignore_index=True)
+            new_df = new_df.drop_duplicates(subset=key, keep="last")
+        new_df = new_df.sort_values(key, ignore_index=True)
+        table = pa.Table.from_pandas(new_df, preserve_index=False)
+        ds.write_dataset(
+            table,
+            self.path(route),
+            format="parquet",
+            partitioning=_partitioning(partitions),
+            basename_template="part-{i}.parquet",
+            existing_data_behavior="delete_matching",
+        )
+        return table
+
+    def read_table(
+        self,
+        route: str,
+        facets: dict = None,
+        start: str = None,
+        end: str = None,
+        columns: list = None,
+    ) -> pa.Table:
+        """
+        Read a route's dataset as an Arrow table.
+
+        :param route: The API route (or dataset name).
+        :param facets: Facet filters (e.g. {"msn": ["ELETPUS"]}).
+        :param start: First period (inclusive, EIA period string).
+        :param end: Last period (inclusive, EIA period string).
+        :param columns: Columns to read (optional, default all).
+
+        :return: The matching rows (an empty table if nothing is stored).
+        :rtype: pa.Table
+        """
+        partitions = self.partitions(route)
+        if not partitions:
+            return pa.table({})
+        dataset = self._dataset(route, partitions)
+        expression = _and(_facet_filter(facets), _period_filter(start, end))
+        return dataset.to_table(columns=columns, filter=expression)
+
+    def read(
+        self,
+        route: str,
+        facets: dict = None,
+        start: str = None,
+        end: str = None,
+        columns: list = None,
+    ) -> pd.DataFrame:
+        """
+        Read a route's dataset as a dataframe (see :meth:`read_table`).
+
+        :return: The matching rows sorted by period (empty if nothing matches).
+        :rtype: pd.DataFrame
+        """
+        table = self.read_table(route, facets, start, end, columns)
+        data_df = table.to_pandas()
+        if PERIOD_COLUMN in data_df:
+            data_df = data_df.sort_values(
+                PERIOD_COLUMN, ignore_index=True, kind="stable"
+            )
+        return data_df
@@ -2,6 +2,37 @@
 EIA client utilities (common helper functions) module.
 """
 
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import importlib
+
+
+class LazyModule:
+    """
+    A module imported on first attribute access.
+
+    Heavy dependencies (pandas, pyarrow, requests) are bound with this so
+    importing the package, the endpoint builders or the CLI doesn't pay for
+    them until they are used, e.g. ``pd = LazyModule("pandas")``.
+
+    :param name: The module name.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+requests = LazyModule("requests")
+
+
 def list_if_str(obj) -> list:
     """Helper function for converting a string object to a list."""
     return [obj] if isinstance(obj, str) else obj
@@ -10,3 +41,39 @@ def list_if_str(obj) -> list:
 def list_if_none(obj) -> list:
     """Helper function for converting a None object to an empty list."""
     return [] if obj is None else obj
+
+
+def ordered_map(func, items, max_workers: int = 1):
+    """
+    Helper function for mapping a function over items with a thread pool.
+
+    Results are yielded in the order of items. At most ``2 * max_workers``
+    results are in flight (or waiting to be consumed) at any time, so memory
+    stays bounded no matter how many items there are.
+    """
+    if max_workers <= 1:
+        yield from map(func, items)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in items:
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, item))
+        while pending:
+            yield pending.popleft().result()
+
+
+def make_response(
+    status_code: int, body: bytes, headers: dict = None, url: str = "", reason: str = ""
+) -> requests.Response:
+    """Helper function for building a requests response from raw parts."""
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp._content = body  # pylint: disable=protected-access
+    resp._content_consumed = True  # pylint: disable=protected-access
+    resp.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    resp.url = url
+    resp.reason = reason
+    resp.encoding = "utf-8"
+    return resp
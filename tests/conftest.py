@@ -0,0 +1,166 @@
+"""Shared test fixtures.
+
+The fake EIA v2 API of the benchmarks (``benchmarks/fake_eia.py``) is served
+from a local thread with small synthetic datasets, so the client can be
+tested end to end without touching api.eia.gov.
+"""
+
+from pathlib import Path
+from threading import Thread
+import copy
+import sys
+
+import pytest
+
+from eia_client.api_key import ApiKey
+from eia_client.endpoint import ElectricityRetailSales, TotalEnergy
+from eia_client.endpoint.builder import Endpoint
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1].joinpath("benchmarks")))
+from fake_eia import FakeEIA  # noqa: E402 pylint: disable=wrong-import-position
+
+
+def total_energy_rows(n_months: int = 120, msn: tuple = ("ELETPUS",)) -> list:
+    """Synthetic total-energy rows (monthly, newest first)."""
+    rows = []
+    for code in msn:
+        for i in range(n_months):
+            year, month = 2000 + i // 12, i % 12 + 1
+            rows.append(
+                {
+                    "period": f"{year}-{month:02d}",
+                    "msn": code,
+                    "seriesDescription": f"Series {code}",
+                    "value": str(float(i)),
+                    "unit": "Billion Kilowatthours",
+                }
+            )
+    return rows
+
+
+def retail_sales_rows(
+    n_months: int = 24, states: tuple = ("CA", "NY"), sectors: tuple = ("RES", "COM")
+) -> list:
+    """Synthetic electricity retail-sales rows."""
+    rows = []
+    for state in states:
+        for sector in sectors:
+            for i in range(n_months):
+                year, month = 2020 + i // 12, i % 12 + 1
+                rows.append(
+                    {
+                        "period": f"{year}-{month:02d}",
+                        "stateid": state,
+                        "stateDescription": state,
+                        "sectorid": sector,
+                        "sectorName": sector.lower(),
+                        "customers": str(1000 + i),
+                        "price": str(10.0 + i / 10),
+                        "revenue": str(100.0 + i),
+                        "sales": str(200.0 + i),
+                    }
+                )
+    return rows
+
+
+def rto_rows(
+    n_hours: int = 48, respondents: tuple = ("CISO", "ERCO"), types: tuple = ("D",)
+) -> list:
+    """Synthetic electricity RTO region-data rows (hourly)."""
+    rows = []
+    for respondent in respondents:
+        for type_ in types:
+            for i in range(n_hours):
+                day, hour = 1 + i // 24, i % 24
+                rows.append(
+                    {
+                        "period": f"2024-01-{day:02d}T{hour:02d}",
+                        "respondent": respondent,
+                        "respondent-name": respondent,
+                        "type": type_,
+                        "type-name": type_,
+                        "value": str(1000 + i),
+                        "value-units": "megawatthours",
+                    }
+                )
+    return rows
+
+
+def total_energy_endpoint(server, **kwargs) -> Endpoint:
+    """A total energy endpoint pointing at the fake server."""
+    endpoint = TotalEnergy(api_key=ApiKey("TEST"), **kwargs).build()
+    return Endpoint(f"{server.url}/total-energy/data", endpoint.params)
+
+
+def retail_sales_endpoint(server, **kwargs) -> Endpoint:
+    """A retail sales endpoint pointing at the fake server."""
+    endpoint = ElectricityRetailSales(api_key=ApiKey("TEST"), **kwargs).build()
+    return Endpoint(f"{server.url}/electricity/retail-sales/data", endpoint.params)
+
+
+METADATA = {
+    "/v2/total-energy": {
+        "id": "total-energy",
+        "name": "Total Energy",
+        "frequency": [
+            {"id": "monthly", "format": "YYYY-MM"},
+            {"id": "annual", "format": "YYYY"},
+        ],
+        "facets": [{"id": "msn", "description": "MSN"}],
+        "data": {"value": {"units": "various"}},
+        "startPeriod": "2000-01",
+        "endPeriod": "2009-12",
+        "defaultFrequency": "monthly",
+    },
+    "/v2/electricity/retail-sales": {
+        "id": "retail-sales",
+        "name": "Electricity Sales to Ultimate Customers",
+        "frequency": [{"id": "monthly", "format": "YYYY-MM"}],
+        "facets": [
+            {"id": "stateid", "description": "State / Census Region"},
+            {"id": "sectorid", "description": "Sector"},
+        ],
+        "data": {
+            "customers": {"units": "number of customers"},
+            "price": {"units": "cents per kilowatt-hour"},
+            "revenue": {"units": "million dollars"},
+            "sales": {"units": "million kilowatt hours"},
+        },
+        "startPeriod": "2020-01",
+        "endPeriod": "2021-12",
+        "defaultFrequency": "monthly",
+    },
+    "/v2/electricity/rto/region-data": {
+        "id": "region-data",
+        "name": "Hourly Demand By Balancing Authority",
+        "frequency": [
+            {"id": "hourly", "format": "YYYY-MM-DD\"T\"HH24"},
+            {"id": "local-hourly", "format": "YYYY-MM-DD\"T\"HH24TZH"},
+        ],
+        "facets": [
+            {"id": "respondent", "description": "Balancing Authority"},
+            {"id": "type", "description": "Type"},
+        ],
+        "data": {"value": {"units": "megawatthours"}},
+        "startPeriod": "2024-01-01T00",
+        "endPeriod": "2024-01-02T23",
+        "defaultFrequency": "hourly",
+    },
+}
+
+
+@pytest.fixture
+def eia_server():
+    """A running fake EIA server."""
+    server = FakeEIA()
+    server.datasets = {
+        "/v2/total-energy/data": total_energy_rows(),
+        "/v2/electricity/retail-sales/data": retail_sales_rows(),
+        "/v2/electricity/rto/region-data/data": rto_rows(),
+    }
+    server.metadata = copy.deepcopy(METADATA)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -6,6 +6,7 @@ from dataclasses import asdict
 
 from eia_client.endpoint import TotalEnergy
 from eia_client.api_key import ApiKey
+from eia_client.endpoint.builder import join_api_key
 
 
 def test_total_energy_endpoint():
@@ -47,3 +48,38 @@ def test_total_energy_start_end():
         "offset": 0,
         "length": 5000,
     }
+
+
+def test_prepare_canonical_query():
+    """Test the prepared request encodes params as canonical url query params."""
+    endpoint = TotalEnergy(
+        api_key=ApiKey("TEST"), msn=["NGETPUS", "ELETPUS"], start="2020-01"
+    ).build()
+    prepared = endpoint.prepare()
+    assert prepared.url == "https://api.eia.gov/v2/total-energy/data"
+    assert prepared.query == (
+        ("frequency", "monthly"),
+        ("data[0]", "value"),
+        ("facets[msn][]", "ELETPUS"),
+        ("facets[msn][]", "NGETPUS"),
+        ("start", "2020-01"),
+        ("sort[0][column]", "period"),
+        ("sort[0][direction]", "desc"),
+        ("offset", "0"),
+        ("length", "5000"),
+    )
+    reordered = TotalEnergy(
+        api_key=ApiKey("TEST"), msn=["ELETPUS", "NGETPUS"], start="2020-01"
+    ).build()
+    assert hash(prepared) == hash(reordered.prepare())
+    assert prepared.key == reordered.prepare().key
+    assert prepared.with_api_key(ApiKey("KEY"))[-1] == ("api_key", "KEY")
+
+
+def test_join_api_key_does_not_mutate():
+    """Test joining the api key returns a new endpoint."""
+    endpoint = TotalEnergy(api_key=ApiKey("TEST")).build()
+    joined = join_api_key(join_api_key(endpoint, ApiKey("KEY")), ApiKey("KEY"))
+    assert endpoint.endpoint == "https://api.eia.gov/v2/total-energy/data"
+    assert joined.endpoint == f"{endpoint.endpoint}/?api_key=KEY"
+    assert joined.prepare() == endpoint.prepare()
@@ -0,0 +1,37 @@
+"""Test eia_client.async_client module."""
+
+import asyncio
+
+from conftest import total_energy_endpoint, total_energy_rows
+from eia_client.api_key import ApiKey
+from eia_client.async_client import AsyncClient
+
+
+def test_async_get_all(eia_server):
+    """Test async pagination returns every row in offset order."""
+
+    async def run():
+        async with AsyncClient(api_key=ApiKey("TEST"), max_concurrency=3) as client:
+            return await client.get_all(total_energy_endpoint(eia_server, length=25))
+
+    data_df = asyncio.run(run())
+    assert data_df.shape[0] == 120
+    assert data_df["period"].is_monotonic_decreasing
+
+
+def test_async_gather(eia_server):
+    """Test fan-out across many MSNs."""
+    msns = ("ELETPUS", "CLETPUS", "NGETPUS")
+    eia_server.datasets["/v2/total-energy/data"] = total_energy_rows(msn=msns)
+
+    async def run():
+        async with AsyncClient(api_key=ApiKey("TEST")) as client:
+            return await client.gather(
+                [total_energy_endpoint(eia_server, msn=msn, length=50) for msn in msns]
+            )
+
+    frames = asyncio.run(run())
+    assert [data_df["msn"].unique().tolist() for data_df in frames] == [
+        [msn] for msn in msns
+    ]
+    assert all(data_df.shape[0] == 120 for data_df in frames)
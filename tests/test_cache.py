@@ -0,0 +1,121 @@
+"""Test eia_client.cache module."""
+
+from tempfile import TemporaryDirectory
+from pathlib import Path
+
+from eia_client.api_key import ApiKey
+from eia_client.cache import (
+    CACHE_HEADER,
+    ResponseCache,
+    is_unchanged,
+    request_key,
+)
+from eia_client.client import Client
+from eia_client.endpoint import TotalEnergy
+from eia_client.endpoint.builder import Endpoint
+from eia_client.parse import as_dataframe
+
+from conftest import total_energy_endpoint
+
+
+def test_request_key_ignores_api_key():
+    """Test the canonical key doesn't depend on the API key."""
+    endpoint = TotalEnergy(api_key=ApiKey("TEST")).build()
+    keyed = Endpoint(f"{endpoint.endpoint}/?api_key=SECRET", endpoint.params)
+    assert request_key(endpoint) == request_key(keyed)
+    assert request_key(endpoint) != request_key(
+        TotalEnergy(api_key=ApiKey("TEST"), msn="CLETPUS").build()
+    )
+
+
+def test_client_cache_hit(eia_server):
+    """Test a repeated query is served from the cache."""
+    with TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(Path(tmp_dir).joinpath("cache.sqlite"))
+        client = Client(api_key=ApiKey("TEST"), cache=cache)
+        first = client.get_all(total_energy_endpoint(eia_server, length=50))
+        second = client.get_all(total_energy_endpoint(eia_server, length=50))
+        cache.close()
+    assert len(eia_server.requests) == 3
+    assert (cache.stats.hits, cache.stats.misses) == (3, 3)
+    assert first.equals(second)
+
+
+def test_cache_ttl_and_eviction(eia_server):
+    """Test expired entries miss and the size cap evicts old entries."""
+    with TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(
+            Path(tmp_dir).joinpath("cache.sqlite"),
+            route_ttl={"/total-energy/data": -1},
+        )
+        client = Client(api_key=ApiKey("TEST"), cache=cache)
+        client.get(total_energy_endpoint(eia_server))
+        client.get(total_energy_endpoint(eia_server))
+        assert cache.stats.hits == 0
+        cache.ttl, cache.route_ttl, cache.max_bytes = 3600, {}, 1
+        client.get(total_energy_endpoint(eia_server, msn="CLETPUS"))
+        cache.close()
+    assert cache.stats.evictions == 2
+
+
+def test_conditional_revalidation(eia_server):
+    """Test stale entries are revalidated with If-None-Match (304)."""
+    eia_server.etags = True
+    with TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(Path(tmp_dir).joinpath("cache.sqlite"), ttl=-1)
+        client = Client(api_key=ApiKey("TEST"), cache=cache)
+        client.get(total_energy_endpoint(eia_server))
+        resp = client.get(total_energy_endpoint(eia_server))
+        cache.close()
+    assert resp.status_code == 200
+    assert is_unchanged(resp)
+    assert (cache.stats.misses, cache.stats.revalidated) == (1, 1)
+    assert not as_dataframe(resp).empty
+
+
+def test_revalidation_of_evicted_entry(eia_server, monkeypatch):
+    """Test a 304 for an entry evicted meanwhile is refetched in full."""
+    eia_server.etags = True
+    with TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(Path(tmp_dir).joinpath("cache.sqlite"), ttl=-1)
+        client = Client(api_key=ApiKey("TEST"), cache=cache)
+        client.get(total_energy_endpoint(eia_server))
+        conditional_headers = cache.conditional_headers
+
+        def evicting_headers(endpoint):
+            headers = conditional_headers(endpoint)
+            cache.clear()
+            return headers
+
+        monkeypatch.setattr(cache, "conditional_headers", evicting_headers)
+        resp = client.get(total_energy_endpoint(eia_server))
+        cache.close()
+    assert len(eia_server.requests) == 3  # initial, 304, refetch
+    assert resp.status_code == 200
+    assert as_dataframe(resp).shape[0] == 120
+
+
+def test_digest_unchanged(eia_server):
+    """Test refetched bodies are compared by digest without validators."""
+    with TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(Path(tmp_dir).joinpath("cache.sqlite"), ttl=-1)
+        client = Client(api_key=ApiKey("TEST"), cache=cache)
+        assert not is_unchanged(client.get(total_energy_endpoint(eia_server)))
+        assert is_unchanged(client.get(total_energy_endpoint(eia_server)))
+        cache.close()
+    assert cache.stats.unchanged == 1
+
+
+def test_streamed_responses_not_stored(eia_server):
+    """Test a streamed response isn't downloaded to be cached."""
+    with TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(Path(tmp_dir).joinpath("cache.sqlite"))
+        client = Client(api_key=ApiKey("TEST"), cache=cache)
+        resp = client.get(total_energy_endpoint(eia_server), stream=True)
+        assert not resp._content_consumed  # pylint: disable=protected-access
+        assert as_dataframe(resp, stream=True).shape[0] == 120
+        assert cache.get(total_energy_endpoint(eia_server)) is None
+        client.get(total_energy_endpoint(eia_server))
+        resp = client.get(total_energy_endpoint(eia_server), stream=True)
+        assert resp.headers[CACHE_HEADER] == "hit"
+        cache.close()
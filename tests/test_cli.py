@@ -0,0 +1,109 @@
+"""Test eia_client.cli module."""
+
+from argparse import Namespace
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import json
+
+import pandas as pd
+
+from eia_client import cli
+from eia_client.api_key import ApiKey
+from eia_client.store import DatasetStore
+
+
+def _args(tmp_dir: str, manifest: Path = None, **kwargs) -> Namespace:
+    args = dict(
+        output_directory=tmp_dir,
+        output_format="parquet",
+        manifest=manifest,
+        workers=None,
+    )
+    return Namespace(**dict(args, **kwargs))
+
+
+def _no_default_key(*args, **kwargs):
+    raise RuntimeError("No API key.")
+
+
+def test_batch_command(eia_server):
+    """Test running a manifest of jobs concurrently."""
+    manifest = {
+        "base": eia_server.url,
+        "workers": 2,
+        "jobs": [
+            {"name": "eletpus", "endpoint": "total_energy", "msn": "ELETPUS"},
+            {
+                "name": "ca",
+                "endpoint": "electricity_retail_sales",
+                "state": "CA",
+                "data": ["price", "sales"],
+                "output_format": "csv",
+            },
+            {"name": "typo", "endpoint": "total_enrgy"},
+        ],
+    }
+    with TemporaryDirectory() as tmp_dir:
+        manifest_path = Path(tmp_dir).joinpath("manifest.json")
+        manifest_path.write_text(json.dumps(manifest))
+        results = cli._batch_command(ApiKey("TEST"), _args(tmp_dir, manifest_path))
+        assert [r.name for r in results] == ["eletpus", "ca", "typo"]
+        assert results[0].rows == 120
+        assert pd.read_parquet(results[0].output).shape[0] == 120
+        assert results[1].rows == 48
+        assert results[1].output.name == "ca.csv"
+        assert results[2].error is not None
+
+
+def test_batch_command_route_job(eia_server, monkeypatch):
+    """Test a route job uses the manifest base and the given API key."""
+    manifest = {
+        "base": eia_server.url,
+        "jobs": [
+            {
+                "name": "ciso",
+                "route": "electricity/rto/region-data",
+                "respondent": "CISO",
+            }
+        ],
+    }
+    with TemporaryDirectory() as tmp_dir:
+        monkeypatch.setattr(
+            "eia_client.metadata.get_default_metadata_dir", lambda: Path(tmp_dir)
+        )
+        monkeypatch.setattr("eia_client.api_key.load", _no_default_key)
+        manifest_path = Path(tmp_dir).joinpath("manifest.json")
+        manifest_path.write_text(json.dumps(manifest))
+        results = cli._batch_command(ApiKey("TEST"), _args(tmp_dir, manifest_path))
+    assert results[0].error is None
+    assert results[0].rows == 48
+    assert eia_server.requests[0][0] == "/v2/electricity/rto/region-data"
+
+
+def test_batch_command_toml_dataset(eia_server):
+    """Test a TOML manifest writing into a dataset store."""
+    manifest = f"""
+base = "{eia_server.url}"
+
+[defaults]
+output_format = "dataset"
+
+[[jobs]]
+name = "res"
+endpoint = "electricity_retail_sales"
+sector = "RES"
+
+[[jobs]]
+name = "com"
+endpoint = "electricity_retail_sales"
+sector = "COM"
+"""
+    with TemporaryDirectory() as tmp_dir:
+        manifest_path = Path(tmp_dir).joinpath("manifest.toml")
+        manifest_path.write_text(manifest)
+        results = cli._batch_command(
+            ApiKey("TEST"), _args(tmp_dir, manifest_path, workers=2)
+        )
+        assert all(r.error is None for r in results)
+        store = DatasetStore(tmp_dir)
+        assert store.read("/electricity/retail-sales/data").shape[0] == 96
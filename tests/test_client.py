@@ -0,0 +1,128 @@
+"""Test eia_client.client module."""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from requests import Response
+
+from eia_client import parse
+from eia_client import utils
+from eia_client.api_key import ApiKey
+from eia_client.client import Client
+from eia_client.exceptions import ResponseError
+from eia_client.endpoint import TotalEnergy
+
+from conftest import total_energy_endpoint
+
+
+def test_iter_pages(eia_server):
+    """Test that every offset window is requested once."""
+    client = Client(api_key=ApiKey("TEST"))
+    pages = list(client.iter_pages(total_energy_endpoint(eia_server, length=50)))
+    assert len(pages) == 3
+    assert [params["offset"] for _, params in eia_server.requests] == [0, 50, 100]
+
+
+def test_get_all(eia_server, monkeypatch):
+    """Test that all pages are concatenated into one dataframe."""
+    decoded = []
+    monkeypatch.setattr(Response, "json", lambda resp: decoded.append(resp) or {})
+    client = Client(api_key=ApiKey("TEST"))
+    endpoint = total_energy_endpoint(eia_server, length=50)
+    client.get_all(endpoint)
+    assert len(decoded) == 3  # one decode per page, the first included
+    monkeypatch.undo()
+    data_df = client.get_all(endpoint)
+    assert data_df.shape[0] == 120
+    assert data_df["period"].is_unique
+    assert endpoint.endpoint == f"{eia_server.url}/total-energy/data"
+
+
+def test_get_all_concurrent(eia_server):
+    """Test that concurrently fetched pages are reassembled in offset order."""
+    client = Client(api_key=ApiKey("TEST"), max_workers=4)
+    data_df = client.get_all(total_energy_endpoint(eia_server, length=10))
+    assert len(eia_server.requests) == 12
+    assert data_df["period"].is_monotonic_decreasing
+    assert data_df.shape[0] == 120
+
+
+def test_get_all_stream(eia_server):
+    """Test streamed pages parse to the same data."""
+    client = Client(api_key=ApiKey("TEST"), max_workers=2)
+    streamed = client.get_all(total_energy_endpoint(eia_server, length=25), stream=True)
+    assert streamed.equals(client.get_all(total_energy_endpoint(eia_server, length=25)))
+
+
+def test_get_all_arrow(eia_server):
+    """Test pages are concatenated into one Arrow table."""
+    client = Client(api_key=ApiKey("TEST"), max_workers=2)
+    table = client.get_all_arrow(
+        total_energy_endpoint(eia_server, length=50), schema=TotalEnergy.SCHEMA
+    )
+    assert table.num_rows == 120
+    assert table.to_pandas()["value"].dtype == "float64"
+
+
+def test_get_all_parse_pool(eia_server):
+    """Test pages parsed in a process pool match pages parsed in-thread."""
+    client = Client(api_key=ApiKey("TEST"), max_workers=2)
+    endpoint = total_energy_endpoint(eia_server, length=25)
+    expected = client.get_all(endpoint, schema=TotalEnergy.SCHEMA)
+    expected_table = client.get_all_arrow(endpoint, schema=TotalEnergy.SCHEMA)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        client = Client(api_key=ApiKey("TEST"), max_workers=2, parse_pool=pool)
+        data_df = client.get_all(endpoint, schema=TotalEnergy.SCHEMA)
+        table = client.get_all_arrow(endpoint, schema=TotalEnergy.SCHEMA)
+        eia_server.failures.append(500)
+        with pytest.raises(ResponseError):
+            client.get_all(endpoint)
+    assert data_df.equals(expected)
+    assert data_df["period"].dtype == "period[M]"
+    assert table.equals(expected_table)
+
+
+def test_parse_pool_window(eia_server, monkeypatch):
+    """Test bodies waiting in the parse pool are bounded by max_workers."""
+    submitted = []
+    read = []
+    in_flight = []
+    read_ipc = parse.read_ipc
+
+    class Pool(ThreadPoolExecutor):
+        """Records how many submitted bodies haven't been read back."""
+
+        def submit(self, *args, **kwargs):
+            submitted.append(1)
+            in_flight.append(len(submitted) - len(read))
+            return super().submit(*args, **kwargs)
+
+    def counting_read_ipc(buffer):
+        read.append(1)
+        return read_ipc(buffer)
+
+    monkeypatch.setattr(parse, "read_ipc", counting_read_ipc)
+    with Pool(max_workers=2) as pool:
+        client = Client(api_key=ApiKey("TEST"), max_workers=2, parse_pool=pool)
+        data_df = client.get_all(total_energy_endpoint(eia_server, length=5))
+    assert data_df.shape[0] == 120
+    assert len(submitted) == 24
+    # The window of the pool plus the fetch look-ahead of the workers.
+    assert max(in_flight) <= 2 * 4 + 1
+
+
+def test_per_call_workers_capped(eia_server, monkeypatch):
+    """Test per-call workers don't outnumber the pooled connections."""
+    workers = []
+    ordered_map = utils.ordered_map
+
+    def recording_map(func, items, max_workers=1):
+        workers.append(max_workers)
+        return ordered_map(func, items, max_workers=max_workers)
+
+    monkeypatch.setattr(utils, "ordered_map", recording_map)
+    client = Client(api_key=ApiKey("TEST"), max_workers=2)
+    pages = client.iter_pages(total_energy_endpoint(eia_server, length=10), 8)
+    assert len(list(pages)) == 12
+    client.get_all(total_energy_endpoint(eia_server, length=50), max_workers=1)
+    assert workers == [2, 1]
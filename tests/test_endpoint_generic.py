@@ -0,0 +1,79 @@
+"""Test eia_client.endpoint.generic module."""
+
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from eia_client import endpoint as ec_endpoint
+from eia_client.api_key import ApiKey
+from eia_client.client import Client
+from eia_client.endpoint.generic import GenericEndpoint, class_name, endpoint_class
+from eia_client.exceptions import ValidationError
+from eia_client.metadata import Catalog
+
+
+ROUTE = "electricity/rto/region-data"
+
+
+def test_class_name():
+    """Test class names generated from routes."""
+    assert class_name(ROUTE) == "ElectricityRtoRegionData"
+    assert class_name("natural-gas/pri/sum") == "NaturalGasPriSum"
+
+
+def test_endpoint_class_from_metadata(eia_server):
+    """Test a builder class is generated once from the route metadata."""
+    client = Client(api_key=ApiKey("TEST"))
+    with TemporaryDirectory() as tmp_dir:
+        catalog = Catalog(client, tmp_dir, base=eia_server.url)
+        region_data = endpoint_class(ROUTE, catalog)
+        assert endpoint_class(f"/{ROUTE}/data", catalog) is region_data
+    assert issubclass(region_data, GenericEndpoint)
+    assert region_data.__name__ == "ElectricityRtoRegionData"
+    assert region_data.FACETS == ("respondent", "type")
+    assert region_data.DEFAULT_FREQUENCY == "hourly"
+    assert region_data.SCHEMA["value"] == "float"
+    assert len(eia_server.requests) == 1
+
+
+def test_generic_builder_hourly(eia_server):
+    """Test fetching hourly RTO data with a generated builder."""
+    client = Client(api_key=ApiKey("TEST"))
+    with TemporaryDirectory() as tmp_dir:
+        catalog = Catalog(client, tmp_dir, base=eia_server.url)
+        region_data = endpoint_class(ROUTE, catalog)
+        builder = region_data(
+            api_key=ApiKey("TEST"), respondent="CISO", type="D", length=10
+        )
+        endpoint = builder.build()
+        assert endpoint.params.data == ["value"]
+        assert endpoint.params.facets == {"respondent": ["CISO"], "type": ["D"]}
+        data_df = client.get_all(endpoint, schema=region_data.SCHEMA)
+        with pytest.raises(ValidationError, match="did you mean CISO"):
+            region_data(api_key=ApiKey("TEST"), respondent="CIS").build()
+    assert data_df.shape[0] == 48
+    assert data_df["period"].dtype == "period[h]"
+    assert data_df["value"].dtype == "float64"
+
+
+def test_generic_builder_rejects_unknown_arguments(eia_server):
+    """Test names are validated without fetching facet values."""
+    client = Client(api_key=ApiKey("TEST"))
+    with TemporaryDirectory() as tmp_dir:
+        catalog = Catalog(client, tmp_dir, base=eia_server.url)
+        region_data = endpoint_class(ROUTE, catalog)
+    with pytest.raises(ValidationError):
+        region_data(api_key=ApiKey("TEST"), frequency="monthly")
+    with pytest.raises(ValidationError):
+        region_data(api_key=ApiKey("TEST"), data="price")
+    with pytest.raises(ValidationError):
+        region_data(api_key=ApiKey("TEST"), state="CA")
+    assert len(eia_server.requests) == 1
+
+
+def test_package_routes_are_lazy():
+    """Test known routes are listed but not created on import."""
+    assert "ElectricityRtoRegionData" in ec_endpoint.ROUTES
+    assert "ElectricityRtoRegionData" not in vars(ec_endpoint)
+    with pytest.raises(AttributeError):
+        ec_endpoint.NotARoute  # pylint: disable=pointless-statement
@@ -0,0 +1,53 @@
+"""Test heavy dependencies are imported lazily."""
+
+import subprocess
+import sys
+
+import pytest
+
+
+HEAVY = ("pandas", "pyarrow", "requests", "aiohttp", "opentelemetry")
+
+
+def _imported(statement: str) -> set:
+    """Heavy modules imported by a statement in a fresh interpreter."""
+    code = f"import sys\n{statement}\nprint(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return set(output.split()) & set(HEAVY)
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import eia_client",
+        "import eia_client.cli",
+        "from eia_client.endpoint import TotalEnergy; TotalEnergy.SCHEMA",
+        "import eia_client.api_key, eia_client.period, eia_client.endpoint.generic",
+        "import eia_client.store",
+        "import eia_client.instrument",
+    ],
+)
+def test_no_heavy_imports(statement):
+    """Test importing the package, CLI and builders skips heavy dependencies."""
+    assert _imported(statement) == set()
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "from eia_client import Client",
+        "import eia_client.async_client",
+        "import eia_client.sync",
+    ],
+)
+def test_clients_defer_pandas_and_pyarrow(statement):
+    """Test the clients only need requests until data is parsed."""
+    assert _imported(statement) == {"requests"}
+
+
+def test_lazy_attributes():
+    """Test lazily imported submodules and classes resolve on access."""
+    assert "pandas" in _imported("import eia_client; eia_client.parse.pd.DataFrame")
+    assert _imported("import eia_client; eia_client.Client") == {"requests"}
@@ -0,0 +1,86 @@
+"""Test eia_client.instrument module."""
+
+from tempfile import TemporaryDirectory
+from pathlib import Path
+
+from eia_client.api_key import ApiKey
+from eia_client.cache import ResponseCache
+from eia_client.client import Client
+from eia_client.endpoint import TotalEnergy
+from eia_client.instrument import Aggregator, Event, OpenTelemetryExporter
+from eia_client.retry import RetryPolicy
+
+from conftest import total_energy_endpoint
+
+
+def test_client_hooks(eia_server):
+    """Test requests, parsing and cache lookups are reported to hooks."""
+    events = []
+    aggregator = Aggregator()
+    retry = RetryPolicy(backoff_base=0, jitter=False)
+    with TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(Path(tmp_dir).joinpath("cache.sqlite"))
+        client = Client(
+            api_key=ApiKey("TEST"), cache=cache, retry=retry, hooks=[events.append]
+        )
+        client.add_hook(aggregator)
+        eia_server.failures.append(503)
+        endpoint = total_energy_endpoint(eia_server, length=50)
+        client.get_all(endpoint, schema=TotalEnergy.SCHEMA)
+        client.get_all(endpoint, schema=TotalEnergy.SCHEMA)
+        cache.close()
+    requests = [e for e in events if e.name == "request"]
+    assert len(requests) == 3
+    assert requests[0].attributes["attempts"] == 2
+    assert requests[0].attributes["status"] == 200
+    assert requests[0].attributes["bytes"] > 0
+    assert {"latency", "download", "throttled"} <= requests[0].attributes.keys()
+    parses = [e for e in events if e.name == "parse"]
+    assert sum(e.attributes["rows"] for e in parses) == 240
+    assert {"decode", "build"} <= parses[0].attributes.keys()
+    summary = aggregator.summary()
+    assert summary["request"]["count"] == 3
+    assert summary["request"]["attempts"] == 4
+    assert summary["cache"]["result:miss"] == 3
+    assert summary["cache"]["result:hit"] == 3
+    assert summary["parse"]["rows"] == 240
+
+
+def test_failing_hook_is_ignored(eia_server):
+    """Test a hook raising doesn't fail the request."""
+
+    def hook(event: Event):
+        raise ValueError(event.name)
+
+    client = Client(api_key=ApiKey("TEST"), hooks=[hook])
+    assert client.get(total_energy_endpoint(eia_server, length=50)).status_code == 200
+
+
+def test_open_telemetry_exporter():
+    """Test events are recorded as spans with their timings and attributes."""
+
+    class Span:
+        def __init__(self, name, start_time, attributes):
+            self.name = name
+            self.start_time = start_time
+            self.attributes = attributes
+            self.end_time = None
+
+        def end(self, end_time):
+            self.end_time = end_time
+
+    class Tracer:
+        def __init__(self):
+            self.spans = []
+
+        def start_span(self, name, start_time, attributes):
+            self.spans.append(Span(name, start_time, attributes))
+            return self.spans[-1]
+
+    tracer = Tracer()
+    exporter = OpenTelemetryExporter(tracer)
+    exporter(Event("request", 10.0, 0.5, {"url": "u", "status": 200, "x": [1]}))
+    span = tracer.spans[0]
+    assert span.name == "eia_client.request"
+    assert span.attributes == {"url": "u", "status": 200}
+    assert span.end_time - span.start_time == 500_000_000
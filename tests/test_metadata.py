@@ -0,0 +1,95 @@
+"""Test eia_client.metadata module."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import json
+import time
+
+import pytest
+
+from eia_client.api_key import ApiKey
+from eia_client.client import Client
+from eia_client.endpoint import ElectricityRetailSales, TotalEnergy
+from eia_client.exceptions import ResponseError, ValidationError
+from eia_client.metadata import Catalog, route_path
+
+
+def test_route_path():
+    """Test routes, urls and data urls normalize to the same route path."""
+    assert route_path("https://api.eia.gov/v2/total-energy/data") == "total-energy"
+    assert route_path("/electricity/retail-sales/data/") == "electricity/retail-sales"
+    assert route_path("electricity/retail-sales") == "electricity/retail-sales"
+
+
+def test_catalog_route_and_facets(eia_server):
+    """Test route metadata and facet values are fetched once then cached."""
+    client = Client(api_key=ApiKey("TEST"))
+    with TemporaryDirectory() as tmp_dir:
+        catalog = Catalog(client, tmp_dir, base=eia_server.url)
+        metadata = catalog.route("/electricity/retail-sales/data")
+        assert metadata.facets.keys() == {"stateid", "sectorid"}
+        assert "price" in metadata.data
+        assert metadata.frequencies == {"monthly": "YYYY-MM"}
+        assert catalog.facet_values("electricity/retail-sales", "stateid") == {
+            "CA": "CA",
+            "NY": "NY",
+        }
+        assert catalog.cardinality("electricity/retail-sales", "sectorid") == 2
+        assert len(eia_server.requests) == 3
+        # A new catalog reads the disk cache instead of the API.
+        catalog = Catalog(client, tmp_dir, base=eia_server.url)
+        assert catalog.cardinality("electricity/retail-sales", "stateid") == 2
+    assert len(eia_server.requests) == 3
+
+
+def test_catalog_shared_between_threads(eia_server):
+    """Test concurrent lookups fetch and write the cache file once."""
+    eia_server.latency = 0.1
+    client = Client(api_key=ApiKey("TEST"), max_workers=4)
+    with TemporaryDirectory() as tmp_dir:
+        catalog = Catalog(client, tmp_dir, base=eia_server.url)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            starts = pool.map(
+                lambda _: catalog.route("total-energy").start_period, range(4)
+            )
+            assert list(starts) == ["2000-01"] * 4
+        assert [p.name for p in Path(tmp_dir).iterdir()] == ["total-energy.json"]
+    assert len(eia_server.requests) == 1
+
+
+def test_catalog_ttl_and_stale_fallback(eia_server):
+    """Test expired metadata is refetched, or used if refetching fails."""
+    client = Client(api_key=ApiKey("TEST"))
+    with TemporaryDirectory() as tmp_dir:
+        Catalog(client, tmp_dir, base=eia_server.url).route("total-energy")
+        cache_file = next(Path(tmp_dir).iterdir())
+        cached = json.loads(cache_file.read_text())
+        cached["fetched"] = time.time() - 3600
+        cache_file.write_text(json.dumps(cached))
+        Catalog(client, tmp_dir, ttl=60, base=eia_server.url).route("total-energy")
+        assert len(eia_server.requests) == 2
+        eia_server.failures.append(500)
+        catalog = Catalog(client, tmp_dir, ttl=0, base=eia_server.url)
+        assert catalog.route("total-energy").start_period == "2000-01"
+        eia_server.failures.append(500)
+        with pytest.raises(ResponseError):
+            catalog.route("electricity/retail-sales")
+
+
+def test_build_validates_against_catalog(eia_server):
+    """Test typos are caught at build time, without requesting data."""
+    client = Client(api_key=ApiKey("TEST"))
+    with TemporaryDirectory() as tmp_dir:
+        catalog = Catalog(client, tmp_dir, base=eia_server.url)
+        builder = ElectricityRetailSales(
+            api_key=ApiKey("TEST"), state=["CA", "XX"], sector="RES", data="price"
+        )
+        with pytest.raises(ValidationError, match="stateid:XX"):
+            builder.build(catalog=catalog)
+        builder = TotalEnergy(api_key=ApiKey("TEST"), msn="ELETPU")
+        with pytest.raises(ValidationError, match="did you mean ELETPUS"):
+            builder.build(catalog=catalog)
+        builder = TotalEnergy(api_key=ApiKey("TEST"), msn="ELETPUS")
+        assert builder.build(catalog=catalog).params.facets == {"msn": ["ELETPUS"]}
+    assert all("/data" not in route for route, _ in eia_server.requests)
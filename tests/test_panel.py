@@ -0,0 +1,82 @@
+"""Test eia_client.panel module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eia_client import panel
+from eia_client.endpoint import ElectricityRetailSales, TotalEnergy
+from eia_client.parse import typed_dataframe
+
+from conftest import retail_sales_rows, total_energy_rows
+
+
+def test_build_matches_pivot():
+    """Test a panel equals the pandas pivot of the long data."""
+    rows = total_energy_rows(n_months=36, msn=("ELETPUS", "CLETPUS"))
+    rows = [row for row in rows if row["period"] != "2001-06"]
+    data_df = typed_dataframe(rows, TotalEnergy.SCHEMA)
+    result = panel.build([data_df.iloc[:30], data_df.iloc[30:]], series="msn")
+    assert result.values.shape == (36, 2)
+    assert list(result.series) == ["CLETPUS", "ELETPUS"]
+    assert result.freq == "M" and str(result.periods[0]) == "2000-01"
+    assert np.isnan(result.values[17]).all()
+    expected = data_df.pivot(index="period", columns="msn", values="value")
+    pd.testing.assert_frame_equal(
+        result.to_frame().dropna(how="all"),
+        expected.reindex(columns=result.series).astype("float64"),
+        check_names=False,
+        check_column_type=False,
+    )
+
+
+def test_build_multiple_series_columns():
+    """Test untyped pages keyed by state and sector."""
+    data_df = pd.DataFrame(retail_sales_rows(n_months=12, states=("CA", "NY")))
+    result = panel.build(data_df, series=["stateid", "sectorid"], value="price")
+    assert result.values.shape == (12, 4)
+    assert list(result.series) == [
+        ("CA", "COM"),
+        ("CA", "RES"),
+        ("NY", "COM"),
+        ("NY", "RES"),
+    ]
+    assert result.values[1, 3] == pytest.approx(10.1)
+    typed_df = typed_dataframe(retail_sales_rows(), ElectricityRetailSales.SCHEMA)
+    sales = panel.build(typed_df, series=["stateid", "sectorid"], value="sales")
+    assert sales.values[-1, 0] == pytest.approx(223.0)
+
+
+def test_resample_annual():
+    """Test vectorized monthly to annual aggregation."""
+    # 2000-01 to 2002-06, valued 0 to 29.
+    data_df = typed_dataframe(total_energy_rows(n_months=30), TotalEnergy.SCHEMA)
+    monthly = panel.build(data_df)
+    annual = monthly.resample("annual")
+    assert [str(p) for p in annual.periods] == ["2000", "2001", "2002"]
+    assert annual.values[:, 0].tolist() == [66.0, 210.0, 159.0]
+    complete = monthly.resample("Y", how="mean", min_count=12)
+    assert complete.values[:2, 0].tolist() == [5.5, 17.5]
+    assert np.isnan(complete.values[2, 0])
+    assert monthly.resample("Q", how="last").values[:2, 0].tolist() == [2.0, 5.0]
+    with pytest.raises(RuntimeError):
+        annual.resample("monthly")
+
+
+def test_align_mixed_frequencies():
+    """Test aligning monthly and annual panels on the annual frequency."""
+    monthly = panel.build(
+        typed_dataframe(total_energy_rows(n_months=24), TotalEnergy.SCHEMA)
+    )
+    rows = [
+        {"period": str(year), "msn": "TETCBUS", "value": str(year)}
+        for year in (2001, 2002)
+    ]
+    annual = panel.build(pd.DataFrame(rows), frequency="annual")
+    result = panel.align([monthly, annual], how=["sum", "mean"])
+    assert result.freq == "Y"
+    assert list(result.series) == ["ELETPUS", "TETCBUS"]
+    assert [str(p) for p in result.periods] == ["2000", "2001", "2002"]
+    np.testing.assert_array_equal(
+        result.values, [[66.0, np.nan], [210.0, 2001.0], [np.nan, 2002.0]]
+    )
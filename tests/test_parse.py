@@ -0,0 +1,123 @@
+"""Test eia_client.parse module."""
+
+import json
+
+from eia_client import parse
+from eia_client import period
+from eia_client.endpoint import ElectricityRetailSales, TotalEnergy
+from eia_client.utils import make_response
+
+from conftest import retail_sales_rows, total_energy_rows
+
+
+def _response(rows: list, frequency: str = "monthly"):
+    body = {"response": {"total": len(rows), "frequency": frequency, "data": rows}}
+    return make_response(200, json.dumps(body).encode("utf-8"))
+
+
+def test_as_dataframe_untyped():
+    """Test the default parse keeps columns as returned."""
+    data_df = parse.as_dataframe(_response(total_energy_rows(12)))
+    assert data_df.shape == (12, 5)
+    assert data_df["value"].iloc[3] == "3.0"
+
+
+def test_as_dataframe_typed_total_energy():
+    """Test the typed parse with the total energy schema."""
+    data_df = parse.as_dataframe(
+        _response(total_energy_rows(12)), schema=TotalEnergy.SCHEMA
+    )
+    assert str(data_df["period"].dtype) == "period[M]"
+    assert data_df["value"].dtype == "float64"
+    assert data_df["msn"].dtype == "category"
+    assert data_df["value"].sum() == sum(range(12))
+
+
+def test_as_dataframe_typed_retail_sales():
+    """Test the typed parse with missing values and concatenation."""
+    rows = retail_sales_rows(12)
+    rows[0]["customers"] = None
+    rows[1]["price"] = "NA"
+    pages = [
+        parse.as_dataframe(_response(page), schema=ElectricityRetailSales.SCHEMA)
+        for page in (rows[:20], rows[20:])
+    ]
+    data_df = parse.concat(pages, schema=ElectricityRetailSales.SCHEMA)
+    assert data_df["customers"].dtype == "Int64"
+    assert data_df["customers"].isna().sum() == 1
+    assert data_df["price"].isna().sum() == 1
+    assert data_df["stateid"].dtype == "category"
+    assert data_df.shape[0] == 48
+
+
+def test_iter_rows_small_chunks():
+    """Test incremental parsing across arbitrary chunk boundaries."""
+    rows = retail_sales_rows(6)
+    body = json.dumps(
+        {
+            "response": {"total": 24, "frequency": "monthly", "data": rows},
+            "request": {"params": {"data": ["price"]}},
+        },
+        indent=1,
+    ).encode("utf-8")
+    meta = {}
+    chunks = (body[i : i + 7] for i in range(0, len(body), 7))
+    assert list(parse.iter_rows(chunks, meta)) == rows
+    assert meta == {"total": 24, "frequency": "monthly"}
+
+
+def test_response_total_stops_before_rows():
+    """Test the total is read without decoding the rows after it."""
+    body = json.dumps({"apiVersion": "2.1.0", "response": {"total": "240"}})
+    assert parse.response_total(body.encode("utf-8")) == 240
+    body = b'{"response": {"total": "24", "data": [not json'
+    assert parse.response_total(body) == 24
+    assert parse.response_total(b'{"response": {"data": []}}') == 0
+
+
+def test_as_dataframe_stream():
+    """Test the streamed parse matches the buffered parse."""
+    resp = _response(total_energy_rows(2500))
+    streamed = parse.as_dataframe(resp, schema=TotalEnergy.SCHEMA, stream=True)
+    buffered = parse.as_dataframe(resp, schema=TotalEnergy.SCHEMA)
+    assert streamed.equals(buffered)
+
+
+def test_as_arrow_typed():
+    """Test the Arrow parse with the retail sales schema."""
+    rows = retail_sales_rows(12)
+    rows[0]["price"] = "NA"
+    table = parse.as_arrow(_response(rows), schema=ElectricityRetailSales.SCHEMA)
+    assert table.num_rows == 48
+    assert str(table.schema.field("price").type) == "double"
+    assert table.column("price").null_count == 1
+    assert str(table.schema.field("customers").type) == "int64"
+    assert str(table.schema.field("stateid").type).startswith("dictionary")
+    streamed = parse.as_arrow(
+        _response(rows), schema=ElectricityRetailSales.SCHEMA, stream=True
+    )
+    assert streamed.equals(table)
+
+
+def test_as_ipc_round_trip():
+    """Test IPC parsed dataframes keep their pandas types."""
+    resp = _response(total_energy_rows(12))
+    expected = parse.as_dataframe(resp, schema=TotalEnergy.SCHEMA)
+    buffer = parse.as_ipc(resp.content, schema=TotalEnergy.SCHEMA)
+    assert parse.read_ipc(buffer).to_pandas().equals(expected)
+    buffer = parse.as_ipc(resp.content, TotalEnergy.SCHEMA, dataframe=False)
+    assert parse.read_ipc(buffer).equals(parse.as_arrow(resp, TotalEnergy.SCHEMA))
+
+
+def test_local_hourly_periods_left_as_strings():
+    """Test local hourly periods (with a UTC offset) parse with a schema."""
+    rows = [
+        {"period": "2024-01-01T00-05", "respondent": "PJM", "value": "1"},
+        {"period": "2024-01-01T01-05", "respondent": "PJM", "value": "2"},
+    ]
+    schema = {"period": "period", "respondent": "category", "value": "float"}
+    data_df = parse.as_dataframe(_response(rows, "local-hourly"), schema=schema)
+    assert data_df["period"].tolist() == ["2024-01-01T00-05", "2024-01-01T01-05"]
+    table = parse.as_arrow(_response(rows, "local-hourly"), schema=schema)
+    assert str(table.schema.field("period").type) == "string"
+    assert period.shift("2024-01-01T00-05", "local-hourly", -3) == "2023-12-31T21-05"
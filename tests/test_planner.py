@@ -0,0 +1,110 @@
+"""Test eia_client.planner module."""
+
+from eia_client import planner
+from eia_client.api_key import ApiKey
+from eia_client.client import Client
+from eia_client.endpoint import ElectricityRetailSales, TotalEnergy
+from eia_client.endpoint.builder import Endpoint
+
+from conftest import retail_sales_endpoint, total_energy_endpoint, total_energy_rows
+
+
+def test_period_windows():
+    """Test inclusive, non-overlapping windows."""
+    assert planner.period_windows("2020-01", "2020-07", "monthly", 3) == [
+        ("2020-01", "2020-03"),
+        ("2020-04", "2020-06"),
+        ("2020-07", "2020-07"),
+    ]
+    assert planner.period_windows("2001", "2002", "annual", 5) == [("2001", "2002")]
+
+
+def test_plan():
+    """Test facet values times period windows."""
+    endpoint = ElectricityRetailSales(
+        api_key=ApiKey("TEST"), state=["CA", "NY"], start="2020-01", end="2021-12"
+    ).build()
+    shards = planner.plan(endpoint, facets=("stateid",), periods=12)
+    assert [(s.params.facets["stateid"], s.params.start) for s in shards] == [
+        (["CA"], "2020-01"),
+        (["CA"], "2021-01"),
+        (["NY"], "2020-01"),
+        (["NY"], "2021-01"),
+    ]
+    shards = planner.plan(endpoint, facets={"sectorid": ["RES", "COM", "IND"]})
+    assert len(shards) == 3
+    assert shards[0].params.facets == {"stateid": ["CA", "NY"], "sectorid": ["RES"]}
+    assert planner.plan(endpoint) == [endpoint]
+
+
+def test_get_shards(eia_server):
+    """Test shards are stitched back into the unsplit result."""
+    client = Client(api_key=ApiKey("TEST"), max_workers=4)
+    endpoint = retail_sales_endpoint(
+        eia_server, state=["CA", "NY"], start="2020-01", end="2021-12", length=10
+    )
+    shards = planner.plan(endpoint, facets={"sectorid": ["RES", "COM"]}, periods=6)
+    assert len(shards) == 8
+    sharded = client.get_shards(shards)
+    unsplit = client.get_all(endpoint)
+    assert sharded.shape == unsplit.shape == (96, 9)
+    assert sharded["period"].tolist() == unsplit["period"].tolist()
+
+
+def test_merge():
+    """Test deduplication and merging on the one differing facet."""
+    endpoints = [
+        TotalEnergy(api_key=ApiKey("TEST"), msn=msn).build()
+        for msn in ("ELETPUS", "CLETPUS", "ELETPUS", "NGETPUS")
+    ]
+    endpoints.append(TotalEnergy(api_key=ApiKey("TEST"), frequency="annual").build())
+    queries = planner.merge(endpoints, max_merged=2)
+    assert [(q.endpoint.params.facets, q.members, q.facet) for q in queries] == [
+        ({"msn": ["ELETPUS", "CLETPUS"]}, [0, 2, 1], "msn"),
+        ({"msn": ["NGETPUS"]}, [3], None),
+        ({"msn": ["ELETPUS"]}, [4], None),
+    ]
+
+
+def test_get_many(eia_server):
+    """Test merged queries are split back per input with per-item errors."""
+    msns = ("ELETPUS", "CLETPUS", "NGETPUS")
+    eia_server.datasets["/v2/total-energy/data"] = total_energy_rows(12, msn=msns)
+    client = Client(api_key=ApiKey("TEST"), max_workers=2)
+    endpoints = {msn: total_energy_endpoint(eia_server, msn=msn) for msn in msns}
+    params = endpoints["ELETPUS"].params
+    endpoints["missing"] = Endpoint(f"{eia_server.url}/missing/data", params)
+    results = client.get_many(endpoints)
+    assert list(results) == [*msns, "missing"]
+    assert len(eia_server.requests) == 2
+    for msn in msns:
+        assert results[msn].data["msn"].unique().tolist() == [msn]
+        assert results[msn].data.shape[0] == 12
+    assert results["missing"].error.status_code == 404
+
+
+def test_get_many_unfiltered_facet(eia_server):
+    """Test a query with an empty facet list isn't merged with filtered ones."""
+    msns = ("ELETPUS", "CLETPUS", "NGETPUS")
+    eia_server.datasets["/v2/total-energy/data"] = total_energy_rows(12, msn=msns)
+    client = Client(api_key=ApiKey("TEST"))
+    endpoints = [total_energy_endpoint(eia_server, msn=msn) for msn in msns[:2]]
+    endpoints.append(total_energy_endpoint(eia_server, msn=[]))
+    assert [q.members for q in planner.merge(endpoints)] == [[0, 1], [2]]
+    results = client.get_many(endpoints)
+    assert results[2].data.shape == client.get_all(endpoints[2]).shape == (36, 5)
+    assert results[0].data.shape[0] == 12
+
+
+def test_get_many_empty_merged_result(eia_server):
+    """Test a merged query without rows gives every member an empty frame."""
+    msns = ("ELETPUS", "CLETPUS")
+    eia_server.datasets["/v2/total-energy/data"] = total_energy_rows(12, msn=msns)
+    client = Client(api_key=ApiKey("TEST"))
+    endpoints = [
+        total_energy_endpoint(eia_server, msn=msn, start="2030-01") for msn in msns
+    ]
+    results = client.get_many(endpoints)
+    assert len(eia_server.requests) == 1
+    assert all(result.error is None for result in results.values())
+    assert all(result.data.empty for result in results.values())
@@ -0,0 +1,40 @@
+"""Test eia_client.rate_limit module."""
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+
+from eia_client import rate_limit
+from eia_client.api_key import ApiKey
+
+
+def test_token_bucket_threads():
+    """Test threads sharing a bucket are smoothed to the rate after the burst."""
+    bucket = rate_limit.TokenBucket(rate=50, burst=5)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: bucket.acquire(), range(15)))
+    elapsed = time.monotonic() - start
+    assert 0.18 <= elapsed < 1.0
+    assert bucket.stats.acquired == 15
+    assert bucket.stats.throttled == 10
+
+
+def test_token_bucket_async():
+    """Test async tasks wait without blocking each other."""
+    bucket = rate_limit.TokenBucket(rate=100, burst=1)
+
+    async def run():
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(11)))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start >= 0.09
+    assert bucket.stats.throttled_seconds > 0
+
+
+def test_shared_per_api_key():
+    """Test one bucket per API key."""
+    bucket = rate_limit.shared(ApiKey("SHARED"), rate=5)
+    assert rate_limit.shared(ApiKey("SHARED"), rate=10) is bucket
+    assert rate_limit.shared(ApiKey("OTHER"), rate=5) is not bucket
@@ -0,0 +1,82 @@
+"""Test eia_client.result_cache module."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+
+from eia_client.api_key import ApiKey
+from eia_client.client import Client
+from eia_client.endpoint import TotalEnergy
+from eia_client.instrument import Aggregator
+from eia_client.result_cache import ResultCache, nbytes
+
+from conftest import total_energy_endpoint
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"value": range(rows), "msn": ["ELETPUS"] * rows})
+
+
+def test_client_result_cache(eia_server):
+    """Test a repeated query is served without requests or parsing."""
+    aggregator = Aggregator()
+    results = ResultCache()
+    client = Client(api_key=ApiKey("TEST"), result_cache=results, hooks=[aggregator])
+    schema = TotalEnergy.SCHEMA
+    first = client.get_all(total_energy_endpoint(eia_server, length=50), schema=schema)
+    first["value"] = 0.0
+    second = client.get_all(total_energy_endpoint(eia_server, length=50), schema=schema)
+    table = client.get_all_arrow(total_energy_endpoint(eia_server, length=50))
+    client.get_all_arrow(total_energy_endpoint(eia_server, length=50))
+    assert len(eia_server.requests) == 6
+    assert (results.stats.hits, results.stats.misses) == (2, 2)
+    assert second.shape[0] == table.num_rows == 120
+    assert not second["value"].eq(0.0).all()
+    summary = aggregator.summary()["result_cache"]
+    assert (summary["result:miss"], summary["result:hit"]) == (2, 2)
+
+
+def test_copies_protect_cached_results():
+    """Test callers can't mutate cached dataframes."""
+    results = ResultCache()
+    data_df = _frame(10)
+    results.put("key", data_df)
+    data_df.loc[0, "value"] = -1
+    cached = results.get("key")
+    cached.loc[1, "value"] = -1
+    assert results.get("key")["value"].min() == 0
+
+
+def test_byte_bounded_eviction():
+    """Test least recently used results are evicted past max_bytes."""
+    size = nbytes(_frame(100))
+    results = ResultCache(max_bytes=2 * size)
+    results.put("a", _frame(100))
+    results.put("b", _frame(100))
+    results.get("a")
+    results.put("c", _frame(100))
+    assert results.get("b") is None
+    assert results.get("a") is not None and results.get("c") is not None
+    assert (results.size, results.stats.evictions) == (2 * size, 1)
+    results.put("big", _frame(1000))
+    assert results.get("big") is None and len(results) == 2
+    table = pa.table({"value": list(range(100))})
+    assert nbytes(table) == table.nbytes
+
+
+def test_ttl_and_threads():
+    """Test expired results miss and concurrent access keeps the size exact."""
+    results = ResultCache(ttl=-1)
+    results.put("key", _frame(10))
+    assert results.get("key") is None and results.size == 0
+    results = ResultCache(max_bytes=10 * nbytes(_frame(10)))
+
+    def use(i: int) -> None:
+        results.put(i % 20, _frame(10))
+        results.get((i + 1) % 20)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(use, range(1000)))
+    assert len(results) == 10
+    assert results.size == 10 * nbytes(_frame(10))
@@ -0,0 +1,46 @@
+"""Test eia_client.retry module."""
+
+import pytest
+
+from eia_client.api_key import ApiKey
+from eia_client.client import Client
+from eia_client.exceptions import RateLimitError, RetryError
+from eia_client.retry import RetryPolicy
+from eia_client.utils import make_response
+
+from conftest import total_energy_endpoint
+
+
+def test_delay():
+    """Test capped exponential backoff and Retry-After."""
+    policy = RetryPolicy(backoff_base=1, backoff_cap=5, jitter=False)
+    assert [policy.delay(attempt) for attempt in (1, 2, 3, 4)] == [1, 2, 4, 5]
+    resp = make_response(429, b"", headers={"Retry-After": "3"})
+    assert policy.delay(1, resp) == 3
+    long_resp = make_response(429, b"", headers={"Retry-After": "60"})
+    assert policy.delay(1, long_resp) == 60  # Not cut short by the backoff cap.
+    with pytest.raises(RetryError):
+        RetryPolicy(max_retry_after=10).delay(1, long_resp)
+    assert not policy.should_retry(1, make_response(400, b""))
+    assert not policy.should_retry(3, resp)
+
+
+def test_page_retried(eia_server):
+    """Test a failing page is retried on its own during pagination."""
+    client = Client(api_key=ApiKey("TEST"), retry=RetryPolicy(backoff_base=0))
+    pages = client.iter_pages(total_energy_endpoint(eia_server, length=50))
+    next(pages)
+    eia_server.failures = [503, 429]
+    assert sum(1 for _ in pages) == 2
+    offsets = [params["offset"] for _, params in eia_server.requests]
+    assert offsets == [0, 50, 50, 50, 100]
+
+
+def test_retries_exhausted(eia_server):
+    """Test a typed error instead of an empty dataframe."""
+    eia_server.failures = [429, 429]
+    client = Client(api_key=ApiKey("TEST"), retry=RetryPolicy(max_attempts=2))
+    with pytest.raises(RateLimitError) as error:
+        client.get_all(total_energy_endpoint(eia_server))
+    assert error.value.status_code == 429
+    assert "TEST" not in error.value.url
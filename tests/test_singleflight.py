@@ -0,0 +1,62 @@
+"""Test eia_client.singleflight module."""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, Event
+import time
+
+import pytest
+
+from eia_client.api_key import ApiKey
+from eia_client.client import Client
+from eia_client.singleflight import SingleFlight
+
+from conftest import total_energy_endpoint
+
+
+def test_single_flight_shares_result():
+    """Test concurrent callers share one execution."""
+    flight = SingleFlight()
+    release = Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(flight.do, "key", work) for _ in range(4)]
+        deadline = time.monotonic() + 5
+        while flight.coalesced < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        results = [future.result() for future in futures]
+    assert (len(calls), flight.coalesced) == (1, 3)
+    assert results == [("result", True)] * 4
+    assert flight.do("key", lambda: "again") == ("again", False)
+
+
+def test_single_flight_shares_exception():
+    """Test the exception reaches the caller and the key is released."""
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do("key", lambda: int("x"))
+    assert flight.do("key", lambda: 1) == (1, False)
+
+
+def test_client_coalesce(eia_server):
+    """Test concurrent identical get_all calls issue one set of requests."""
+    endpoint = total_energy_endpoint(eia_server, length=40)
+    client = Client(api_key=ApiKey("TEST"), coalesce=True)
+    # Every caller starts together and arrives while the first page is served.
+    eia_server.latency = 0.2
+    start = Barrier(8, timeout=5)
+
+    def get_all(_):
+        start.wait()
+        return client.get_all(endpoint)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        frames = list(executor.map(get_all, range(8)))
+    assert all(data_df.equals(frames[0]) for data_df in frames)
+    assert len(eia_server.requests) == 3
@@ -0,0 +1,100 @@
+"""Test eia_client.store module."""
+
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+
+import pandas as pd
+import pytest
+
+from eia_client import parse
+from eia_client.endpoint import ElectricityRetailSales, TotalEnergy
+from eia_client.store import DatasetStore, route_dir
+
+from conftest import retail_sales_rows, total_energy_rows
+
+
+ROUTE = "/v2/total-energy/data"
+
+
+def test_route_dir():
+    """Test dataset directory names of routes."""
+    assert route_dir(ROUTE) == "total-energy"
+    assert route_dir("/v2/electricity/retail-sales/data") == "electricity.retail-sales"
+    assert route_dir("total_energy_monthly") == "total_energy_monthly"
+
+
+def test_write_partitions_and_filtered_read():
+    """Test the dataset is partitioned by facet and year and read filtered."""
+    rows = total_energy_rows(n_months=36, msn=("ELETPUS", "TETCBUS"))
+    with TemporaryDirectory() as tmp_dir:
+        store = DatasetStore(tmp_dir)
+        store.write(pd.DataFrame(rows), ROUTE, facets=("msn",))
+        files = sorted(
+            str(p.relative_to(store.path(ROUTE)).parent)
+            for p in store.path(ROUTE).rglob("*.parquet")
+        )
+        assert len(files) == 6
+        assert files[0] == "msn=ELETPUS/year=2000"
+        assert store.partitions(ROUTE) == ["msn", "year"]
+        data_df = store.read(
+            ROUTE, facets={"msn": ["TETCBUS"]}, start="2000-11", end="2001-02"
+        )
+    assert list(data_df["period"]) == ["2000-11", "2000-12", "2001-01", "2001-02"]
+    assert set(data_df["msn"]) == {"TETCBUS"}
+
+
+def test_write_merges_touched_partitions():
+    """Test rewriting a partition keeps its rows the new data doesn't cover."""
+    rows = total_energy_rows(n_months=24)
+    with TemporaryDirectory() as tmp_dir:
+        store = DatasetStore(tmp_dir)
+        store.write(pd.DataFrame(rows[:18]), ROUTE, facets=("msn",))
+        update = [dict(row, value="-1.0") for row in rows[16:]]
+        store.write(pd.DataFrame(update), ROUTE, facets=("msn",))
+        data_df = store.read(ROUTE)
+    assert data_df.shape[0] == 24
+    assert data_df["period"].is_unique
+    assert (data_df["value"] == "-1.0").sum() == 8
+
+
+def test_concurrent_writes_to_a_route():
+    """Test concurrent writes into the same partitions don't lose rows."""
+    rows = total_energy_rows(n_months=12)
+    with TemporaryDirectory() as tmp_dir:
+
+        def write(row: dict) -> None:
+            DatasetStore(tmp_dir).write(pd.DataFrame([row]), ROUTE, facets=("msn",))
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(write, rows))
+        data_df = DatasetStore(tmp_dir).read(ROUTE)
+    assert sorted(data_df["period"]) == sorted(row["period"] for row in rows)
+
+
+def test_write_typed_periods():
+    """Test typed (pandas period) columns are stored as EIA period strings."""
+    rows = retail_sales_rows(n_months=12, states=("CA",))
+    schema = ElectricityRetailSales.SCHEMA
+    data_df = parse.typed_dataframe(rows, schema, "monthly")
+    with TemporaryDirectory() as tmp_dir:
+        store = DatasetStore(tmp_dir)
+        store.write(data_df, "electricity/retail-sales", ElectricityRetailSales.FACETS)
+        stored_df = store.read("electricity/retail-sales", end="2020-06")
+    assert stored_df["period"].max() == "2020-06"
+    assert stored_df.shape[0] == 12  # RES and COM
+
+
+def test_write_rejects_other_partitioning():
+    """Test a dataset keeps the partitioning it was created with."""
+    data_df = pd.DataFrame(total_energy_rows(n_months=2))
+    with TemporaryDirectory() as tmp_dir:
+        store = DatasetStore(tmp_dir)
+        store.write(data_df, ROUTE, facets=TotalEnergy.FACETS)
+        with pytest.raises(ValueError):
+            store.write(data_df, ROUTE)
+
+
+def test_read_missing_route():
+    """Test reading a route that was never written."""
+    with TemporaryDirectory() as tmp_dir:
+        assert DatasetStore(tmp_dir).read(ROUTE).empty
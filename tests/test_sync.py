@@ -0,0 +1,116 @@
+"""Test eia_client.sync module."""
+
+from tempfile import TemporaryDirectory
+from pathlib import Path
+
+import pandas as pd
+
+from eia_client import sync
+from eia_client.api_key import ApiKey
+from eia_client.client import Client
+from eia_client.endpoint import ElectricityRetailSales, TotalEnergy
+
+
+def test_sync_fetches_delta(eia_server):
+    """Test the second sync only requests periods after the look-back start."""
+    builder = TotalEnergy(api_key=ApiKey("TEST"))
+    builder.BASE = eia_server.url
+    client = Client(api_key=ApiKey("TEST"))
+    with TemporaryDirectory() as tmp_dir:
+        file_path = Path(tmp_dir).joinpath("ELETPUS.parquet")
+        assert sync.sync(client, builder, file_path).shape[0] == 120
+        rows = eia_server.datasets["/v2/total-energy/data"]
+        rows[-1]["value"] = "-1.0"  # a restatement of 2009-12
+        rows.append(dict(rows[-1], period="2010-01", value="999.0"))
+        data_df = sync.sync(client, builder, file_path, lookback=2)
+    assert eia_server.requests[-1][1]["start"] == "2009-10"
+    assert data_df.shape[0] == 121
+    assert data_df["period"].is_unique
+    assert data_df.set_index("period").loc["2009-12", "value"] == "-1.0"
+
+
+def test_sync_directory_store(eia_server):
+    """Test syncing a state/sector combination into a directory store."""
+    builder = ElectricityRetailSales(
+        api_key=ApiKey("TEST"), state="CA", sector=["RES", "COM"], data=["price"]
+    )
+    builder.BASE = eia_server.url
+    client = Client(api_key=ApiKey("TEST"))
+    with TemporaryDirectory() as tmp_dir:
+        store = Path(tmp_dir).joinpath("ca")
+        sync.sync(client, builder, store)
+        data_df = sync.sync(client, builder, store)
+        assert sorted(p.name for p in store.iterdir()) == [sync.DATA_FILE_NAME]
+    assert data_df.shape[0] == 48
+    assert eia_server.requests[-1][1]["start"] == "2021-09"
+
+
+def test_sync_new_facet_combination(eia_server):
+    """Test a combination missing from the store is fetched in full."""
+    client = Client(api_key=ApiKey("TEST"))
+    with TemporaryDirectory() as tmp_dir:
+        store = Path(tmp_dir).joinpath("ca")
+        for sector in ("RES", ["RES", "COM"]):
+            builder = ElectricityRetailSales(
+                api_key=ApiKey("TEST"), state="CA", sector=sector, data=["price"]
+            )
+            builder.BASE = eia_server.url
+            data_df = sync.sync(client, builder, store)
+    assert "start" not in eia_server.requests[-1][1]
+    assert data_df.groupby("sectorid").size().to_dict() == {"COM": 24, "RES": 24}
+
+
+def test_latest_periods_per_combination():
+    """Test only the filtered combinations are tracked."""
+    stored_df = pd.DataFrame(
+        {
+            "period": ["2021-12", "2021-06", "2021-12"],
+            "stateid": ["CA", "CA", "NY"],
+            "sectorid": ["RES", "TRA", "RES"],
+        }
+    )
+    by = ("stateid", "sectorid")
+    facets = {"stateid": ["CA"], "sectorid": ["RES", "TRA"]}
+    assert sync.latest_periods(stored_df, facets, by) == {
+        (("stateid", "CA"), ("sectorid", "RES")): "2021-12",
+        (("stateid", "CA"), ("sectorid", "TRA")): "2021-06",
+    }
+    # NY/TRA never existed and CA/TRA lags, but sectors aren't filtered.
+    assert sync.latest_periods(stored_df, {"stateid": ["CA", "NY"]}, by) == {
+        (("stateid", "CA"),): "2021-12",
+        (("stateid", "NY"),): "2021-12",
+    }
+    assert sync.latest_periods(stored_df, {"sectorid": []}, by) == {(): "2021-12"}
+    facets = {"stateid": ["NY"], "sectorid": ["RES", "TRA"]}
+    assert sync.latest_periods(stored_df, facets, by)[
+        (("stateid", "NY"), ("sectorid", "TRA"))
+    ] is None
+
+
+def test_sync_lagging_combination(eia_server):
+    """Test a lagging combination is fetched from its own latest period."""
+    builder = ElectricityRetailSales(
+        api_key=ApiKey("TEST"), state="CA", sector=["RES", "COM"], data=["price"]
+    )
+    builder.BASE = eia_server.url
+    client = Client(api_key=ApiKey("TEST"))
+    rows = eia_server.datasets["/v2/electricity/retail-sales/data"]
+    with TemporaryDirectory() as tmp_dir:
+        store = Path(tmp_dir).joinpath("ca")
+        sync.sync(client, builder, store)
+        # RES is published through 2022-02, COM only through 2022-01.
+        latest = [row for row in rows if row["period"] == "2021-12"]
+        for month in ("2022-01", "2022-02"):
+            rows.extend(
+                dict(row, period=month)
+                for row in latest
+                if row["sectorid"] == "RES" or month == "2022-01"
+            )
+        sync.sync(client, builder, store, lookback=0)
+        data_df = sync.sync(client, builder, store, lookback=0)
+    starts = {
+        tuple(params["facets"]["sectorid"]): params["start"]
+        for _, params in eia_server.requests[-2:]
+    }
+    assert starts == {("RES",): "2022-02", ("COM",): "2022-01"}
+    assert data_df.groupby("sectorid").size().to_dict() == {"COM": 25, "RES": 26}